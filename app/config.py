@@ -98,6 +98,16 @@ class Settings(BaseSettings):
         le=1.0,
         description="Voice similarity boost"
     )
+    elevenlabs_latency_level: int = Field(
+        default=3,
+        ge=0,
+        le=4,
+        description="optimize_streaming_latency level for streamed TTS (4 disables text normalization)"
+    )
+    tts_output_format: Literal["ulaw_8000", "pcm_16000"] = Field(
+        default="ulaw_8000",
+        description="TTS format for phone calls (ulaw_8000 is sent to Telnyx without transcoding)"
+    )
     
     # ===========================================
     # Google Gemini Configuration
@@ -134,6 +144,26 @@ class Settings(BaseSettings):
         le=5000,
         description="Minimum silence duration in ms"
     )
+    vad_model_path: str = Field(
+        default="",
+        description="Silero VAD ONNX model (empty = INT8 model in data/ if present, else the one bundled with silero-vad)"
+    )
+    vad_threshold_int8: float | None = Field(
+        default=None,
+        ge=0.0,
+        le=1.0,
+        description="VAD threshold used with an INT8-quantized model (unset = vad_threshold)"
+    )
+    vad_use_gpu: bool = Field(
+        default=False,
+        description="Run large VAD batches on CUDA when onnxruntime-gpu is available"
+    )
+    asr_silence_rms: int = Field(
+        default=200,
+        ge=0,
+        le=32767,
+        description="Turn audio RMS (int16) below which ASR is skipped"
+    )
     
     # ===========================================
     # Performance Settings
@@ -150,6 +180,12 @@ class Settings(BaseSettings):
         le=5000,
         description="Response timeout in ms"
     )
+    backend_max_workers: int = Field(
+        default=16,
+        ge=1,
+        le=256,
+        description="Worker threads for blocking ASR SDK calls"
+    )
     
     @field_validator("log_level", mode="before")
     @classmethod
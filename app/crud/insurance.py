@@ -4,11 +4,14 @@ Nexus Miracle - Insurance CRUD Operations
 Database operations for insurance coverage lookups.
 """
 
+import unicodedata
+from collections.abc import Iterable
+
 from loguru import logger
 from sqlalchemy import or_, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.models.database import Insurance
+from app.models.database import Insurance, InsuranceAlias
 from app.schemas.insurance import InsuranceCheckResponse
 
 
@@ -38,6 +41,31 @@ async def get_all_insurance(
     return list(result.scalars().all())
 
 
+def normalize_insurance_name(name: str) -> str:
+    """Normalize an insurance name for alias lookup (NFKC, casefold, strip)."""
+    return unicodedata.normalize("NFKC", name).casefold().strip()
+
+
+def build_alias_rows(insurance_id: int, names: Iterable[str]) -> list[dict[str, object]]:
+    """
+    Build insurance_aliases rows for a company's names and variations.
+    
+    Args:
+        insurance_id: Insurance record id
+        names: Company name, Arabic name and name_variations
+    
+    Returns:
+        Rows for a bulk insert into InsuranceAlias, one per distinct name
+    """
+    normalized = dict.fromkeys(normalize_insurance_name(n) for n in names)
+    
+    return [
+        {"normalized": alias, "insurance_id": insurance_id}
+        for alias in normalized
+        if alias
+    ]
+
+
 async def get_insurance_by_name(
     session: AsyncSession,
     name: str,
@@ -45,7 +73,8 @@ async def get_insurance_by_name(
     """
     Get insurance by name with fuzzy matching.
     
-    Searches company_name, company_name_ar, and name_variations.
+    Probes the normalized alias index first, then falls back to searching
+    company_name, company_name_ar, and name_variations.
     
     Args:
         session: Database session
@@ -54,6 +83,18 @@ async def get_insurance_by_name(
     Returns:
         Insurance if found, None otherwise
     """
+    # Exact alias hit is a single indexed lookup
+    query = (
+        select(Insurance)
+        .join(InsuranceAlias, InsuranceAlias.insurance_id == Insurance.id)
+        .where(InsuranceAlias.normalized == normalize_insurance_name(name))
+    )
+    result = await session.execute(query)
+    insurance = result.scalar_one_or_none()
+    
+    if insurance:
+        return insurance
+    
     # Normalize search term
     name = name.strip().lower()
     
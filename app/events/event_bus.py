@@ -4,7 +4,6 @@ Provides async publish/subscribe pattern for real-time updates.
 """
 
 import asyncio
-from collections import defaultdict
 from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
@@ -96,7 +95,9 @@ class EventBus:
         if self._initialized:
             return
         
-        self._subscribers: dict[EventType, list[EventHandler]] = defaultdict(list)
+        # Immutable per-type snapshots, rebuilt on (un)subscribe so publish
+        # can iterate them without copying
+        self._subscribers: dict[EventType, tuple[EventHandler, ...]] = {}
         self._websocket_clients: list[Any] = []
         self._event_history: list[Event] = []
         self._max_history = 100
@@ -106,13 +107,16 @@ class EventBus:
     
     def subscribe(self, event_type: EventType, handler: EventHandler) -> None:
         """Subscribe to an event type."""
-        self._subscribers[event_type].append(handler)
+        self._subscribers[event_type] = (*self._subscribers.get(event_type, ()), handler)
         logger.debug(f"Handler subscribed to {event_type.value}")
     
     def unsubscribe(self, event_type: EventType, handler: EventHandler) -> None:
         """Unsubscribe from an event type."""
-        if handler in self._subscribers[event_type]:
-            self._subscribers[event_type].remove(handler)
+        handlers = self._subscribers.get(event_type, ())
+        if handler in handlers:
+            remaining = list(handlers)
+            remaining.remove(handler)
+            self._subscribers[event_type] = tuple(remaining)
             logger.debug(f"Handler unsubscribed from {event_type.value}")
     
     def on(self, event_type: EventType) -> Callable[[EventHandler], EventHandler]:
@@ -145,8 +149,10 @@ class EventBus:
         logger.info(f"Publishing event: {event_type.value} from {source}")
         
         # Notify all subscribers
-        handlers = self._subscribers.get(event_type, [])
-        if handlers:
+        handlers = self._subscribers.get(event_type)
+        if handlers and len(handlers) == 1:
+            await self._safe_call(handlers[0], event)
+        elif handlers:
             await asyncio.gather(
                 *[self._safe_call(handler, event) for handler in handlers],
                 return_exceptions=True,
@@ -5,6 +5,7 @@ Main application entry point with middleware, exception handlers,
 lifespan events, and router mounting.
 """
 
+import asyncio
 import sys
 from contextlib import asynccontextmanager
 from pathlib import Path
@@ -44,6 +45,7 @@ def setup_logging() -> None:
         colorize=True,
         backtrace=True,
         diagnose=settings.debug,
+        enqueue=True,  # Write from a background thread, off the event loop
     )
     
     # File handler with rotation
@@ -64,6 +66,7 @@ def setup_logging() -> None:
         compression="gz",
         backtrace=True,
         diagnose=settings.debug,
+        enqueue=True,
     )
     
     logger.info(
@@ -98,12 +101,27 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     logger.info(f"Environment: {settings.app_env}")
     logger.info(f"Debug mode: {settings.debug}")
     
+    # Eager task factory runs trivially-ready coroutines without a loop
+    # round-trip (Python 3.12+ only)
+    eager_task_factory = getattr(asyncio, "eager_task_factory", None)
+    if eager_task_factory is not None:
+        asyncio.get_running_loop().set_task_factory(eager_task_factory)
+        logger.info("Eager task factory enabled")
+    
     # Initialize database
     from app.services.db_service import init_db, create_tables
     await init_db()
     await create_tables()
     logger.info("Database initialized")
     
+    # Shared HTTP connection pool for TTS requests
+    from app.services.http_service import init_http_client
+    await init_http_client()
+    
+    # Telnyx client, so its connection is warm before the first call
+    from app.services.telnyx_service import get_telnyx_service
+    await get_telnyx_service().initialize()
+    
     logger.info("Application startup complete")
     
     yield
@@ -111,6 +129,14 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     # Shutdown
     logger.info("Shutting down application...")
     
+    # Drain background call control requests and close the Telnyx pool
+    from app.services.telnyx_service import get_telnyx_service
+    await get_telnyx_service().shutdown()
+    
+    # Close shared HTTP connections
+    from app.services.http_service import close_http_client
+    await close_http_client()
+    
     # Close database connections
     from app.services.db_service import close_db
     await close_db()
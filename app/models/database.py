@@ -389,6 +389,33 @@ class Insurance(Base, TimestampMixin):
         return f"<Insurance(id={self.id}, company='{self.company_name}', covered={self.is_covered})>"
 
 
+class InsuranceAlias(Base):
+    """Normalized insurance name lookup (primary names and name_variations)."""
+    
+    __tablename__ = "insurance_aliases"
+    
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    
+    # NFKC + casefold + strip, see crud.insurance.normalize_insurance_name
+    normalized: Mapped[str] = mapped_column(
+        String(100),
+        nullable=False,
+        unique=True,
+        index=True,
+    )
+    
+    # Foreign key
+    insurance_id: Mapped[int] = mapped_column(
+        Integer,
+        ForeignKey("insurance.id"),
+        nullable=False,
+        index=True,
+    )
+    
+    def __repr__(self) -> str:
+        return f"<InsuranceAlias(normalized='{self.normalized}', insurance_id={self.insurance_id})>"
+
+
 # ===========================================
 # CallLog Model
 # ===========================================
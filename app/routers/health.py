@@ -7,7 +7,7 @@ Health check endpoint for monitoring and load balancer probes.
 from datetime import datetime, timezone
 from typing import Any
 
-from fastapi import APIRouter
+from fastapi import APIRouter, Response
 from pydantic import BaseModel
 
 from app.config import get_settings
@@ -57,6 +57,21 @@ async def health_check() -> dict[str, Any]:
     }
 
 
+@router.head(
+    "/health",
+    summary="Health Check (status only)",
+    description="Returns 200 without a body, for probes that only need the status.",
+)
+async def health_check_head() -> Response:
+    """
+    Status-only health check.
+    
+    Returns:
+        Empty 200 response; skips building and serializing the health payload.
+    """
+    return Response(status_code=200)
+
+
 @router.get(
     "/ready",
     summary="Readiness Check",
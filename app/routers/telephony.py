@@ -27,6 +27,9 @@ router = APIRouter()
 _active_connections: dict[str, WebSocket] = {}
 _playback_queues: dict[str, PlaybackQueue] = {}
 
+# Media stream codec; TTS audio already in this format is sent as-is
+TELNYX_AUDIO_FORMAT = "ulaw_8000"
+
 
 # ===========================================
 # Request/Response Models
@@ -108,6 +111,9 @@ async def handle_telnyx_webhook(request: Request) -> dict[str, str]:
             webhook_base = settings.webhook_base_url or "https://nexus-miracle-production.up.railway.app"
             stream_url = f"{webhook_base.replace('https://', 'wss://').replace('http://', 'ws://')}/api/telephony/media/{call_control_id}"
             
+            # Synthesize the greeting while Telnyx confirms the answer
+            call_service.prefetch_greeting()
+            
             # Answer the call and start media streaming
             await telnyx.initialize()
             await telnyx.answer_call(
@@ -199,7 +205,7 @@ async def hangup_call(call_control_id: str) -> dict[str, str]:
     
     telnyx = get_telnyx_service()
     await telnyx.initialize()
-    await telnyx.hangup_call(call_control_id)
+    telnyx.run_in_background(telnyx.hangup_call(call_control_id))
     
     # End session
     call_service = get_call_service()
@@ -291,8 +297,11 @@ async def media_websocket(websocket: WebSocket, call_control_id: str) -> None:
                     try:
                         greeting_audio = await call_service.handle_call_answered(call_control_id)
                         
-                        # Convert to Telnyx format and queue
-                        telnyx_audio = audio_processor.ai_to_telnyx(greeting_audio)
+                        # Convert to Telnyx format (encoded once) and queue
+                        if call_service.output_format == TELNYX_AUDIO_FORMAT:
+                            telnyx_audio = greeting_audio
+                        else:
+                            telnyx_audio = audio_processor.ai_to_telnyx_cached(greeting_audio)
                         playback_queue = _playback_queues.get(call_control_id)
                         if playback_queue:
                             await playback_queue.enqueue(telnyx_audio)
@@ -325,7 +334,12 @@ async def media_websocket(websocket: WebSocket, call_control_id: str) -> None:
                     # If response audio generated, queue it
                     if result.get("response_audio"):
                         response_audio = result["response_audio"]
-                        telnyx_audio = audio_processor.ai_to_telnyx(response_audio)
+                        if call_service.output_format == TELNYX_AUDIO_FORMAT:
+                            telnyx_audio = response_audio
+                        else:
+                            telnyx_audio = await asyncio.to_thread(
+                                audio_processor.ai_to_telnyx, response_audio
+                            )
                         
                         playback_queue = _playback_queues.get(call_control_id)
                         if playback_queue:
@@ -7,11 +7,15 @@ Target: <300ms transcription latency.
 """
 
 import asyncio
+import audioop
+import functools
 import io
 import time
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from typing import Any, AsyncGenerator
 
+import numpy as np
 from loguru import logger
 
 from app.config import get_settings
@@ -43,6 +47,7 @@ class ASRService:
         """Initialize the ASR service."""
         self._settings = get_settings()
         self._client: Any = None
+        self._executor: ThreadPoolExecutor | None = None
         self._is_initialized = False
         
         # Statistics
@@ -72,6 +77,10 @@ class ASRService:
                 )
             
             self._client = ElevenLabs(api_key=api_key)
+            self._executor = ThreadPoolExecutor(
+                max_workers=self._settings.backend_max_workers,
+                thread_name_prefix="asr",
+            )
             self._is_initialized = True
             logger.info("ASRService initialized with ElevenLabs Scribe")
             
@@ -86,16 +95,28 @@ class ASRService:
                 details={"error": str(e)},
             )
     
+    def is_silent(self, audio_bytes: bytes | bytearray | memoryview | np.ndarray) -> bool:
+        """
+        Check whether speech audio is too quiet to be worth transcribing.
+        
+        Args:
+            audio_bytes: 16-bit PCM audio
+        
+        Returns:
+            True if its RMS level is below asr_silence_rms
+        """
+        return audioop.rms(audio_bytes, 2) < self._settings.asr_silence_rms
+    
     async def transcribe(
         self,
-        audio_bytes: bytes,
+        audio_bytes: bytes | bytearray | memoryview | np.ndarray,
         language: str = "ar",
     ) -> TranscriptionResult:
         """
         Transcribe audio bytes to text.
         
         Args:
-            audio_bytes: Raw audio bytes (16-bit PCM, 16kHz)
+            audio_bytes: Raw audio (16-bit PCM, 16kHz), bytes-like or int16 array
             language: Language code (ar for Arabic, en for English)
         
         Returns:
@@ -118,7 +139,7 @@ class ASRService:
         start_time = time.time()
         
         try:
-            logger.debug(f"Transcribing {len(audio_bytes)} bytes, language={language}")
+            logger.debug(f"Transcribing {memoryview(audio_bytes).nbytes} bytes, language={language}")
             
             # Convert PCM to WAV format for API
             wav_audio = self._pcm_to_wav(audio_bytes)
@@ -128,7 +149,7 @@ class ASRService:
             audio_file.name = "audio.wav"
             
             # Call ElevenLabs Speech-to-Text API
-            result = await asyncio.to_thread(
+            result = await self._run_blocking(
                 self._client.speech_to_text.convert,
                 file=audio_file,
                 model_id="scribe_v2",
@@ -155,7 +176,7 @@ class ASRService:
             logger.error(f"Transcription failed: {e}")
             raise TranscriptionError(
                 message="Speech transcription failed",
-                details={"error": str(e), "audio_length": len(audio_bytes)},
+                details={"error": str(e), "audio_length": memoryview(audio_bytes).nbytes},
             )
     
     async def transcribe_stream(
@@ -218,7 +239,11 @@ class ASRService:
                 details={"error": str(e)},
             )
     
-    def _pcm_to_wav(self, pcm_data: bytes, sample_rate: int = 16000) -> bytes:
+    def _pcm_to_wav(
+        self,
+        pcm_data: bytes | bytearray | memoryview | np.ndarray,
+        sample_rate: int = 16000,
+    ) -> bytes:
         """
         Convert raw PCM data to WAV format.
         
@@ -236,7 +261,7 @@ class ASRService:
         bits_per_sample = 16
         byte_rate = sample_rate * channels * bits_per_sample // 8
         block_align = channels * bits_per_sample // 8
-        data_size = len(pcm_data)
+        data_size = memoryview(pcm_data).nbytes
         
         # Build WAV header
         wav_header = struct.pack(
@@ -256,7 +281,20 @@ class ASRService:
             data_size,
         )
         
-        return wav_header + pcm_data
+        return wav_header + memoryview(pcm_data).cast("B")
+    
+    async def _run_blocking(self, func: Any, /, **kwargs: Any) -> Any:
+        """
+        Run a blocking SDK call on this service's own worker pool.
+        
+        Requests from all sessions queue here instead of competing with
+        the LLM and other services for the default executor.
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._executor,
+            functools.partial(func, **kwargs),
+        )
     
     def get_stats(self) -> dict[str, float]:
         """Get ASR performance statistics."""
@@ -273,6 +311,9 @@ class ASRService:
         """Cleanup resources."""
         self._is_initialized = False
         self._client = None
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
         logger.info("ASRService shutdown")
 
 
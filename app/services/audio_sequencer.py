@@ -31,10 +31,13 @@ class AudioSegment:
     priority: SegmentPriority = SegmentPriority.NORMAL
     segment_id: str = ""
     text: str = ""
+    sequence: int = 0
     
     def __lt__(self, other: "AudioSegment") -> bool:
-        """Compare by priority (higher priority = processed first)."""
-        return self.priority > other.priority
+        """Compare by priority (higher priority = processed first), then FIFO."""
+        if self.priority != other.priority:
+            return self.priority > other.priority
+        return self.sequence < other.sequence
 
 
 class AudioSequencer:
@@ -112,6 +115,7 @@ class AudioSequencer:
             priority=priority,
             segment_id=f"seg_{self._total_segments}",
             text=text[:50] if text else "",
+            sequence=self._total_segments,
         )
         
         await self._queue.put(segment)
@@ -39,8 +39,14 @@ class AudioProcessor:
     SAMPLES_8K_20MS = 160       # 8000 * 0.020 = 160 samples
     SAMPLES_16K_20MS = 320      # 16000 * 0.020 = 320 samples
     
+    # Max number of pre-encoded prompts kept by ai_to_telnyx_cached
+    MAX_CACHED_ENCODINGS = 32
+    
     def __init__(self) -> None:
         """Initialize the audio processor."""
+        # Pre-encoded Telnyx audio for fixed prompts: pcm_16k -> ulaw_8k
+        self._telnyx_cache: dict[bytes, bytes] = {}
+        
         logger.info("AudioProcessor created")
     
     def ulaw_to_pcm(self, ulaw_bytes: bytes) -> np.ndarray:
@@ -212,6 +218,28 @@ class AudioProcessor:
         
         return ulaw_8k
     
+    def ai_to_telnyx_cached(self, pcm_16k: bytes) -> bytes:
+        """
+        Convert fixed prompt audio (greeting, fillers) to Telnyx format once.
+        
+        Repeated calls with the same audio return the stored encoding,
+        so only the first send pays for resampling and μ-law encoding.
+        
+        Args:
+            pcm_16k: PCM 16-bit 16kHz audio bytes
+        
+        Returns:
+            μ-law encoded 8kHz audio bytes
+        """
+        ulaw_8k = self._telnyx_cache.get(pcm_16k)
+        if ulaw_8k is None:
+            ulaw_8k = self.ai_to_telnyx(pcm_16k)
+            if len(self._telnyx_cache) >= self.MAX_CACHED_ENCODINGS:
+                # Evict the oldest entry
+                self._telnyx_cache.pop(next(iter(self._telnyx_cache)))
+            self._telnyx_cache[pcm_16k] = ulaw_8k
+        return ulaw_8k
+    
     def get_chunk_samples(self, sample_rate: int, duration_ms: int = 20) -> int:
         """
         Calculate number of samples for a given duration.
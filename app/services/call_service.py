@@ -8,6 +8,7 @@ for handling phone calls end-to-end.
 from typing import Any
 from uuid import UUID
 
+import numpy as np
 from loguru import logger
 
 from app.config import get_settings
@@ -21,7 +22,8 @@ from app.models.conversation import (
 from app.services.asr_service import ASRService, get_asr_service
 from app.services.llm_service import LLMService, get_llm_service
 from app.services.tts_service import TTSService, Voice, get_tts_service
-from app.services.vad_service import VADService, get_vad_service
+from app.services.vad_service import VADEvent, VADService, get_vad_service
+from app.utils.audio_buffer import PCMRingBuffer
 
 
 class CallService:
@@ -64,10 +66,21 @@ class CallService:
         self._sessions: dict[str, ConversationSession] = {}
         
         # Audio buffer for accumulating speech
-        self._audio_buffers: dict[str, bytes] = {}
+        self._audio_buffers: dict[str, PCMRingBuffer] = {}
+        
+        # Per-call VAD state (model inference is shared and batched)
+        self._vad_streams: dict[str, VADService] = {}
+        
+        # Phone audio format requested from TTS
+        self._output_format = self._settings.tts_output_format
         
         logger.info("CallService created")
     
+    @property
+    def output_format(self) -> str:
+        """TTS output format of greeting and response audio."""
+        return self._output_format
+    
     async def initialize(self) -> None:
         """Initialize all services."""
         logger.info("Initializing CallService and dependencies...")
@@ -104,7 +117,8 @@ class CallService:
         )
         
         self._sessions[call_control_id] = session
-        self._audio_buffers[call_control_id] = b""
+        self._audio_buffers[call_control_id] = PCMRingBuffer()
+        self._vad_streams[call_control_id] = await self._vad.create_stream()
         
         logger.info(
             f"Created session {session.id} for call {call_control_id}"
@@ -124,6 +138,14 @@ class CallService:
         """
         return self._sessions.get(call_control_id)
     
+    def prefetch_greeting(self) -> None:
+        """Start synthesizing the greeting without waiting for it."""
+        self._tts.prefetch(
+            text=self._llm.GREETING_TEXT,
+            voice=Voice.SARA,
+            output_format=self._output_format,
+        )
+    
     async def handle_call_answered(
         self,
         call_control_id: str,
@@ -149,7 +171,7 @@ class CallService:
         session.update_state(CallState.ANSWERED)
         
         # Generate greeting
-        greeting = "مرحباً بك في نيكسوس ميراكل. كيف يمكنني مساعدتك اليوم؟"
+        greeting = self._llm.GREETING_TEXT
         
         # Add to conversation
         session.add_message(
@@ -157,10 +179,11 @@ class CallService:
             content=greeting,
         )
         
-        # Synthesize greeting
+        # Synthesize greeting (served from the TTS cache after the first call)
         audio = await self._tts.synthesize(
             text=greeting,
             voice=Voice.SARA,
+            output_format=self._output_format,
         )
         
         session.update_state(CallState.ACTIVE)
@@ -192,41 +215,48 @@ class CallService:
             return {"error": "Session not found"}
         
         # Run VAD
-        vad_result = await self._vad.process_audio(audio_bytes)
+        vad = self._vad_streams[call_control_id]
+        event = await vad.process_audio_event(audio_bytes)
         
         # Accumulate audio if speech detected
-        if vad_result["is_speaking"]:
-            self._audio_buffers[call_control_id] += audio_bytes
+        if vad.is_speaking:
+            self._audio_buffers[call_control_id].write(audio_bytes)
         
         result: dict[str, Any] = {
-            "vad": vad_result,
+            "vad": event,
             "response_audio": None,
         }
         
         # Check if speech ended - trigger response generation
-        if vad_result.get("speech_ended") and self._audio_buffers[call_control_id]:
+        if event is VADEvent.SPEECH_END and self._audio_buffers[call_control_id]:
             logger.debug(f"Speech ended, processing: {call_control_id}")
             
             try:
+                # Skip ASR for silence / background noise
+                speech = self._audio_buffers[call_control_id].snapshot()
+                if self._asr.is_silent(speech):
+                    logger.debug(f"Silent utterance skipped: {call_control_id}")
+                    return result
+                
                 # Process accumulated audio
                 response_audio = await self._process_speech(
                     call_control_id,
-                    self._audio_buffers[call_control_id],
+                    speech,
                 )
                 
                 result["response_audio"] = response_audio
                 
             finally:
                 # Clear buffer
-                self._audio_buffers[call_control_id] = b""
-                self._vad.reset_state()
+                self._audio_buffers[call_control_id].clear()
+                vad.reset()
         
         return result
     
     async def _process_speech(
         self,
         call_control_id: str,
-        audio_bytes: bytes,
+        audio_bytes: bytes | np.ndarray,
     ) -> bytes:
         """
         Process complete speech segment.
@@ -235,7 +265,7 @@ class CallService:
         
         Args:
             call_control_id: Call control ID
-            audio_bytes: Complete speech audio
+            audio_bytes: Complete speech audio (16-bit PCM bytes or int16 array)
         
         Returns:
             Response audio bytes
@@ -254,7 +284,7 @@ class CallService:
         session.add_message(
             role=ConversationRole.USER,
             content=transcript,
-            audio_duration_ms=len(audio_bytes) // 32,  # 16kHz, 16-bit
+            audio_duration_ms=memoryview(audio_bytes).nbytes // 32,  # 16kHz, 16-bit
         )
         
         # 2. Generate response
@@ -277,6 +307,7 @@ class CallService:
         response_audio = await self._tts.synthesize(
             text=response_text,
             voice=voice,
+            output_format=self._output_format,
         )
         
         return response_audio
@@ -311,6 +342,7 @@ class CallService:
         del self._sessions[call_control_id]
         if call_control_id in self._audio_buffers:
             del self._audio_buffers[call_control_id]
+        self._vad_streams.pop(call_control_id, None)
         
         logger.info(f"Session ended: {summary}")
         
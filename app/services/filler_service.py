@@ -296,6 +296,25 @@ class FillerService:
             return []
         return self._categories[category].phrases
     
+    def get_uncached_phrases(self) -> list[FillerPhrase]:
+        """Get all phrases that have no audio in the cache."""
+        return [
+            phrase
+            for category in self._categories.values()
+            for phrase in category.phrases
+            if phrase.id not in self._audio_cache
+        ]
+    
+    def cache_audio(self, phrase_id: str, audio: bytes) -> None:
+        """
+        Store synthesized audio for a phrase.
+        
+        Args:
+            phrase_id: Filler phrase identifier
+            audio: Audio bytes in pipeline output format
+        """
+        self._audio_cache[phrase_id] = audio
+    
     def get_stats(self) -> dict[str, Any]:
         """Get filler usage statistics."""
         return {
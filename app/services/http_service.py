@@ -0,0 +1,58 @@
+"""
+Nexus Miracle - HTTP Client Service
+
+Process-wide httpx client for the async ElevenLabs TTS client, so all
+synthesis requests reuse one connection pool (HTTP/2 multiplexing, warm
+TLS sessions). ASR (sync SDK) and Telnyx keep their own clients.
+"""
+
+import httpx
+from loguru import logger
+
+try:
+    import h2  # noqa: F401
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+    logger.warning("h2 not available, HTTP clients will use HTTP/1.1")
+
+
+# ===========================================
+# Shared Client
+# ===========================================
+
+POOL_LIMITS = httpx.Limits(max_connections=100, max_keepalive_connections=20)
+TIMEOUT = httpx.Timeout(30.0, connect=2.0)
+
+_client: httpx.AsyncClient | None = None
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """Get the shared HTTP client, creating it on first use."""
+    global _client
+    
+    if _client is None:
+        _client = httpx.AsyncClient(
+            http2=HTTP2_AVAILABLE,
+            limits=POOL_LIMITS,
+            timeout=TIMEOUT,
+        )
+        logger.info(f"Shared HTTP client created (http2={HTTP2_AVAILABLE})")
+    
+    return _client
+
+
+async def init_http_client() -> None:
+    """Create the shared client at startup, bound to the app's event loop."""
+    get_http_client()
+
+
+async def close_http_client() -> None:
+    """Close the shared client and its pooled connections."""
+    global _client
+    
+    if _client is not None:
+        await _client.aclose()
+        logger.info("Shared HTTP client closed")
+    
+    _client = None
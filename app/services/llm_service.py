@@ -55,6 +55,9 @@ class LLMService:
     Target: <200ms Time to First Token.
     """
     
+    # Opening line of every call, spoken by Sara
+    GREETING_TEXT = "مرحباً! أنا سارة من عيادة نكسوس مراكل. كيف أقدر أساعدك اليوم؟"
+    
     DEFAULT_SYSTEM_PROMPT = """أنتِ سارة، موظفة استقبال ذكية في عيادة نِكسوس مراكل الطبية في السعودية.
 
 دورك:
@@ -253,6 +256,65 @@ class LLMService:
             logger.error(f"LLM streaming failed: {e}")
             yield '[{"speaker": "sara", "text": "عذراً، حصل خطأ.", "emotion": "concerned"}]'
     
+    async def summarize(
+        self,
+        messages: list[dict[str, str]],
+        previous_summary: str = "",
+    ) -> str:
+        """
+        Condense older conversation messages into a short summary.
+        
+        Args:
+            messages: Messages dropped from the active history window
+            previous_summary: Summary of even older messages to extend
+        
+        Returns:
+            Updated summary text (previous summary if no model is available)
+        """
+        if not self._is_initialized:
+            await self.initialize()
+        
+        if not self._model or not messages:
+            return previous_summary
+        
+        parts = [
+            "لخّص المحادثة التالية بين المريض والمساعد في جملتين، "
+            "مع الاحتفاظ بالأسماء والمواعيد والتفاصيل المهمة.\n\n"
+        ]
+        if previous_summary:
+            parts.append(f"الملخص السابق: {previous_summary}\n\n")
+        for msg in messages:
+            speaker = "المريض" if msg.get("role") == "user" else "المساعد"
+            parts.append(f"{speaker}: {msg.get('content', '')}\n")
+        parts.append("\nالملخص:")
+        
+        try:
+            return (await self._generate("".join(parts))).strip()
+        except Exception as e:
+            logger.warning(f"Conversation summary failed: {e}")
+            return previous_summary
+    
+    async def warmup(self) -> bool:
+        """
+        Issue a 1-token completion to keep the Gemini connection warm.
+        
+        Returns:
+            True if the connection is warm
+        """
+        if not self._model:
+            return False
+        
+        try:
+            await asyncio.to_thread(
+                self._model.generate_content,
+                "ping",
+                generation_config={"max_output_tokens": 1},
+            )
+            return True
+        except Exception as e:
+            logger.debug(f"LLM warm-up failed: {e}")
+            return False
+    
     async def _generate(self, prompt: str) -> str:
         """Generate complete response."""
         response = await asyncio.to_thread(
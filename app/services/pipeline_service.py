@@ -8,21 +8,27 @@ Target: <800ms total latency.
 
 import asyncio
 import time
+from collections import deque
 from dataclasses import dataclass, field
 from typing import Any, Callable, Awaitable
 
+import numpy as np
 from loguru import logger
 
 from app.config import get_settings
 from app.services.asr_service import ASRService, get_asr_service, TranscriptionResult
 from app.services.audio_sequencer import AudioSequencer, SegmentPriority
-from app.services.filler_service import FillerService, get_filler_service
+from app.services.filler_service import FillerPhrase, FillerService, get_filler_service
 from app.services.llm_service import LLMService, get_llm_service, ResponseSegment, ConversationContext
 from app.services.tts_service import TTSService, get_tts_service, Voice
 from app.services.vad_service import VADService, get_vad_service, VADEvent
 
 
-@dataclass
+# Messages kept verbatim in the LLM prompt; older ones are summarized
+MAX_HISTORY_MESSAGES = 12
+
+
+@dataclass(slots=True)
 class CallSession:
     """Active call session state."""
     
@@ -31,30 +37,44 @@ class CallSession:
     called_phone: str = ""
     
     # Conversation state
-    conversation_history: list[dict[str, str]] = field(default_factory=list)
+    conversation_history: deque[dict[str, str]] = field(
+        default_factory=lambda: deque(maxlen=MAX_HISTORY_MESSAGES)
+    )
     system_prompt: str = ""
+    summary: str = ""
+    evicted_messages: list[dict[str, str]] = field(default_factory=list)
+    summary_task: asyncio.Task[None] | None = None
     
     # Audio management
     audio_sequencer: AudioSequencer = field(default_factory=AudioSequencer)
-    audio_buffer: bytes = b""
     
     # Flags
     is_speaking: bool = False
     is_processing: bool = False
     greeting_sent: bool = False
+    current_turn_task: asyncio.Task[Any] | None = None
     
     # Metrics
     total_turns: int = 0
     total_latency_ms: float = 0.0
-    start_time: float = field(default_factory=time.time)
+    start_ns: int = field(default_factory=time.perf_counter_ns)
     
     def add_message(self, role: str, content: str) -> None:
-        """Add message to conversation history."""
-        self.conversation_history.append({
+        """Add message to conversation history, keeping evicted ones for summary."""
+        history = self.conversation_history
+        if len(history) == history.maxlen:
+            self.evicted_messages.append(history[0])
+        history.append({
             "role": role,
             "content": content,
         })
     
+    def get_system_prompt(self) -> str:
+        """Get system prompt extended with the summary of older turns."""
+        if not self.summary:
+            return self.system_prompt
+        return f"{self.system_prompt}\n\n=== ملخص المحادثة السابقة ===\n{self.summary}"
+    
     def get_average_latency(self) -> float:
         """Get average turn latency."""
         if self.total_turns == 0:
@@ -85,6 +105,9 @@ class PipelineService:
     # Filler delay threshold in milliseconds
     FILLER_DELAY_MS = 800
     
+    # Interval between TTS/LLM connection keep-alive pings during calls
+    KEEPALIVE_INTERVAL_S = 20
+    
     def __init__(
         self,
         vad: VADService | None = None,
@@ -115,10 +138,17 @@ class PipelineService:
         # Active sessions
         self._sessions: dict[str, CallSession] = {}
         
+        # Fire-and-forget tasks (history summaries, session finalizers)
+        self._background: set[asyncio.Task[Any]] = set()
+        
         # Statistics
         self._total_turns_processed = 0
         self._total_pipeline_ms = 0.0
         
+        # Connection warmth of the upstream TTS/LLM APIs
+        self._is_warm = False
+        self._keepalive_task: asyncio.Task[None] | None = None
+        
         self._is_initialized = False
         logger.info("PipelineService created")
     
@@ -127,16 +157,78 @@ class PipelineService:
         if self._is_initialized:
             return
         
-        await asyncio.gather(
-            self._vad.initialize(),
-            self._asr.initialize(),
-            self._llm.initialize(),
-            self._tts.initialize(),
-            self._filler.initialize(),
-        )
+        async with asyncio.TaskGroup() as tg:
+            tg.create_task(self._vad.initialize())
+            tg.create_task(self._asr.initialize())
+            tg.create_task(self._llm.initialize())
+            tg.create_task(self._tts.initialize())
+            tg.create_task(self._filler.initialize())
+        
+        async with asyncio.TaskGroup() as tg:
+            warmup = tg.create_task(self._warmup())
+            tg.create_task(self._presynthesize_fillers())
+            tg.create_task(self._cache_greeting())
+        
+        self._is_warm = warmup.result()
+        self._keepalive_task = asyncio.create_task(self._keepalive_loop())
         
         self._is_initialized = True
-        logger.info("PipelineService initialized")
+        logger.info(f"PipelineService initialized (warm={self._is_warm})")
+    
+    async def _warmup(self) -> bool:
+        """Warm the TTS and LLM connections; True if both are warm."""
+        tts_warm, llm_warm = await asyncio.gather(
+            self._tts.warmup(),
+            self._llm.warmup(),
+        )
+        return tts_warm and llm_warm
+    
+    async def _keepalive_loop(self) -> None:
+        """
+        Ping TTS and LLM periodically so connections stay open between turns.
+        
+        The pings are billed requests, so they are only sent while calls
+        are active; an idle instance lets its connections go cold.
+        """
+        while True:
+            await asyncio.sleep(self.KEEPALIVE_INTERVAL_S)
+            if self._sessions:
+                self._is_warm = await self._warmup()
+            else:
+                self._is_warm = False
+    
+    @property
+    def is_warm(self) -> bool:
+        """Check whether upstream TTS/LLM connections are warm."""
+        return self._is_warm
+    
+    async def _presynthesize_fillers(self) -> None:
+        """Synthesize audio for every filler phrase missing from the cache."""
+        phrases = self._filler.get_uncached_phrases()
+        if not phrases:
+            return
+        
+        async def synthesize(phrase: FillerPhrase) -> None:
+            try:
+                audio = await self._tts.synthesize(phrase.text, Voice.SARA)
+            except Exception as e:
+                logger.warning(f"Filler pre-synthesis failed for {phrase.id}: {e}")
+                return
+            if audio:
+                self._filler.cache_audio(phrase.id, audio)
+        
+        async with asyncio.TaskGroup() as tg:
+            for phrase in phrases:
+                tg.create_task(synthesize(phrase))
+        
+        logger.info(f"Pre-synthesized {len(phrases)} filler phrases")
+    
+    async def _cache_greeting(self) -> None:
+        """Synthesize the greeting into the TTS cache ahead of the first call."""
+        try:
+            await self._tts.synthesize(self._llm.GREETING_TEXT, Voice.SARA)
+        except Exception as e:
+            logger.warning(f"Greeting pre-synthesis failed: {e}")
     
     def create_session(
         self,
@@ -176,7 +268,7 @@ class PipelineService:
     async def process_turn(
         self,
         session: CallSession,
-        audio_buffer: bytes,
+        audio_buffer: bytes | bytearray | memoryview | np.ndarray,
         output_callback: Callable[[bytes], Awaitable[None]],
         db_context: ConversationContext | None = None,
     ) -> dict[str, Any]:
@@ -193,11 +285,19 @@ class PipelineService:
         
         Returns:
             Turn processing results with latency metrics
+        
+        Raises:
+            asyncio.CancelledError: If the turn is interrupted by barge-in
         """
         if not self._is_initialized:
             await self.initialize()
         
-        start_time = time.time()
+        # Bind hot-path lookups to locals once per turn
+        now_ns = time.perf_counter_ns
+        asr, llm, tts, filler = self._asr, self._llm, self._tts, self._filler
+        sequencer = session.audio_sequencer
+        
+        start_ns = now_ns()
         metrics = {
             "asr_ms": 0.0,
             "llm_ms": 0.0,
@@ -208,14 +308,20 @@ class PipelineService:
         }
         
         session.is_processing = True
+        session.current_turn_task = turn_task = asyncio.current_task()
         
         try:
+            # 0. Skip ASR entirely for silence / background noise
+            if asr.is_silent(audio_buffer):
+                metrics["skipped"] = "silence"
+                return metrics
+            
             # 1. Transcribe audio
-            asr_start = time.time()
-            transcript = await self._asr.transcribe(audio_buffer)
-            metrics["asr_ms"] = (time.time() - asr_start) * 1000
+            asr_start = now_ns()
+            transcript = await asr.transcribe(audio_buffer)
+            metrics["asr_ms"] = (now_ns() - asr_start) / 1e6
             
-            logger.info(f"ASR ({metrics['asr_ms']:.0f}ms): {transcript.text}")
+            logger.info("ASR ({:.0f}ms): {}", metrics["asr_ms"], transcript.text)
             
             if not transcript.text.strip():
                 return metrics
@@ -224,11 +330,11 @@ class PipelineService:
             session.add_message("user", transcript.text)
             
             # 3. Check for empathy filler
-            empathy_filler = self._filler.get_empathy_filler(transcript.text)
+            empathy_filler = filler.get_empathy_filler(transcript.text)
             if empathy_filler:
                 phrase, audio = empathy_filler
                 if audio:
-                    await session.audio_sequencer.add_segment(
+                    await sequencer.add_segment(
                         audio,
                         speaker="sara",
                         priority=SegmentPriority.HIGH,
@@ -241,51 +347,71 @@ class PipelineService:
                 self._delayed_filler(session, delay_ms=self.FILLER_DELAY_MS)
             )
             
-            # 5. Generate LLM response
-            llm_start = time.time()
-            response_segments = await self._llm.generate_response(
-                user_message=transcript.text,
-                conversation_history=session.conversation_history,
-                system_prompt=session.system_prompt,
-                db_context=db_context,
-            )
-            metrics["llm_ms"] = (time.time() - llm_start) * 1000
-            metrics["segments"] = len(response_segments)
-            
-            logger.info(f"LLM ({metrics['llm_ms']:.0f}ms): {len(response_segments)} segments")
-            
-            # 6. Cancel filler if response arrived quickly
-            filler_task.cancel()
             try:
-                await filler_task
-            except asyncio.CancelledError:
-                pass
-            
-            # 7. Synthesize and queue each segment
-            tts_start = time.time()
-            for segment in response_segments:
-                # Synthesize audio
-                voice = Voice(segment.speaker)
-                audio = await self._tts.synthesize(segment.text, voice)
-                
-                # Queue for playback
-                await session.audio_sequencer.add_segment(
-                    audio,
-                    speaker=segment.speaker,
-                    priority=SegmentPriority.NORMAL,
-                    text=segment.text,
+                # 5. Generate LLM response
+                llm_start = now_ns()
+                response_segments = await llm.generate_response(
+                    user_message=transcript.text,
+                    conversation_history=list(session.conversation_history),
+                    system_prompt=session.get_system_prompt(),
+                    db_context=db_context,
                 )
+                metrics["llm_ms"] = (now_ns() - llm_start) / 1e6
+                metrics["segments"] = len(response_segments)
                 
-                # Add to history
-                session.add_message(segment.speaker, segment.text)
+                logger.info(
+                    "LLM ({:.0f}ms): {} segments", metrics["llm_ms"], len(response_segments)
+                )
+            finally:
+                # 6. Cancel filler if response arrived quickly (or the LLM failed)
+                filler_task.cancel()
             
-            metrics["tts_ms"] = (time.time() - tts_start) * 1000
+            # 7. Synthesize segments (bounded, in order) and queue them,
+            #    starting playback as soon as the first one is ready
+            tts_start = now_ns()
+            response_segments = [segment for segment in response_segments if segment.text.strip()]
+            audio_stream = tts.synthesize_many(
+                [(segment.text, Voice(segment.speaker)) for segment in response_segments]
+            )
+            playback: asyncio.Task[None] | None = None
             
-            # 8. Start playback
-            await session.audio_sequencer.play_sequence(output_callback)
+            try:
+                for segment in response_segments:
+                    audio = await anext(audio_stream)
+                    
+                    # Queue for playback
+                    await sequencer.add_segment(
+                        audio,
+                        speaker=segment.speaker,
+                        priority=SegmentPriority.NORMAL,
+                        text=segment.text,
+                    )
+                    
+                    # Add to history
+                    session.add_message(segment.speaker, segment.text)
+                    
+                    if playback is None:
+                        playback = asyncio.create_task(
+                            sequencer.play_sequence(output_callback)
+                        )
+            except BaseException:
+                if playback is not None:
+                    playback.cancel()
+                raise
+            finally:
+                # Cancels any syntheses still pending
+                await audio_stream.aclose()
+            
+            metrics["tts_ms"] = (now_ns() - tts_start) / 1e6
+            
+            # 8. Finish playback, including segments queued after it drained
+            if playback is not None:
+                await playback
+            if sequencer.queue_size:
+                await sequencer.play_sequence(output_callback)
             
             # 9. Log total time
-            metrics["total_ms"] = (time.time() - start_time) * 1000
+            metrics["total_ms"] = (now_ns() - start_ns) / 1e6
             
             session.total_turns += 1
             session.total_latency_ms += metrics["total_ms"]
@@ -294,21 +420,50 @@ class PipelineService:
             self._total_pipeline_ms += metrics["total_ms"]
             
             logger.info(
-                f"Pipeline complete ({metrics['total_ms']:.0f}ms): "
-                f"ASR={metrics['asr_ms']:.0f}ms, "
-                f"LLM={metrics['llm_ms']:.0f}ms, "
-                f"TTS={metrics['tts_ms']:.0f}ms"
+                "Pipeline complete ({:.0f}ms): ASR={:.0f}ms, LLM={:.0f}ms, TTS={:.0f}ms",
+                metrics["total_ms"],
+                metrics["asr_ms"],
+                metrics["llm_ms"],
+                metrics["tts_ms"],
             )
             
             return metrics
             
+        except asyncio.CancelledError:
+            # Barge-in: child LLM/TTS/playback tasks are torn down on the way out
+            logger.info(
+                "Turn cancelled after {:.0f}ms: {}",
+                (now_ns() - start_ns) / 1e6,
+                session.call_control_id,
+            )
+            raise
+            
         except Exception as e:
             logger.error(f"Pipeline error: {e}")
             metrics["error"] = str(e)
             return metrics
             
         finally:
+            if session.current_turn_task is turn_task:
+                session.current_turn_task = None
             session.is_processing = False
+            self._schedule_summary(session)
+    
+    def _schedule_summary(self, session: CallSession) -> None:
+        """Fold evicted history into the session summary between turns."""
+        if not session.evicted_messages or session.summary_task is not None:
+            return
+        
+        messages = session.evicted_messages
+        session.evicted_messages = []
+        
+        async def summarize() -> None:
+            try:
+                session.summary = await self._llm.summarize(messages, session.summary)
+            finally:
+                session.summary_task = None
+        
+        session.summary_task = self._spawn(summarize())
     
     async def _delayed_filler(
         self,
@@ -326,18 +481,22 @@ class PipelineService:
             await asyncio.sleep(delay_ms / 1000)
             
             # Get and play filler
-            phrase, audio = self._filler.get_random_filler("searching")
+            filler, sequencer = self._filler, session.audio_sequencer
+            phrase, audio = filler.get_random_filler("searching")
             
-            logger.debug(f"Playing delayed filler: {phrase.text}")
+            if not audio:
+                logger.warning(f"Filler audio not cached: {phrase.id}")
+                return
             
-            if audio:
-                await session.audio_sequencer.add_segment(
-                    audio,
-                    speaker="sara",
-                    priority=SegmentPriority.LOW,
-                    text=phrase.text,
-                )
-                
+            logger.debug("Playing delayed filler: {}", phrase.text)
+
+            await sequencer.add_segment(
+                audio,
+                speaker="sara",
+                priority=SegmentPriority.LOW,
+                text=phrase.text,
+            )
+
         except asyncio.CancelledError:
             # Filler cancelled because response arrived
             pass
@@ -346,13 +505,19 @@ class PipelineService:
         """
         Handle user barge-in (interruption).
         
-        Stops current audio playback immediately.
+        Stops current audio playback immediately and cancels the turn
+        still being processed, along with its LLM/TTS requests.
         
         Args:
             session: Call session
         """
         logger.info(f"Barge-in detected: {session.call_control_id}")
         
+        # Abandon the in-progress turn (unless called from within it)
+        turn_task = session.current_turn_task
+        if turn_task is not None and turn_task is not asyncio.current_task():
+            turn_task.cancel()
+        
         # Stop audio sequencer
         session.audio_sequencer.stop()
         
@@ -364,6 +529,9 @@ class PipelineService:
         """
         End a call session.
         
+        The session is removed immediately; logging and cleanup of its
+        background work run afterwards, off the caller's path.
+        
         Args:
             call_control_id: Session identifier
         
@@ -375,23 +543,43 @@ class PipelineService:
         if not session:
             return {"error": "Session not found"}
         
-        duration_s = time.time() - session.start_time
-        
         summary = {
             "call_control_id": call_control_id,
-            "duration_seconds": duration_s,
+            "duration_seconds": (time.perf_counter_ns() - session.start_ns) / 1e9,
             "total_turns": session.total_turns,
             "average_latency_ms": session.get_average_latency(),
             "conversation_length": len(session.conversation_history),
         }
         
-        logger.info(
-            f"Session ended: {call_control_id}, "
-            f"duration={duration_s:.1f}s, turns={session.total_turns}"
-        )
+        self._spawn(self._finalize_session(session, summary))
         
         return summary
     
+    async def _finalize_session(
+        self,
+        session: CallSession,
+        summary: dict[str, Any],
+    ) -> None:
+        """Stop a removed session's background work and log its summary."""
+        summary_task = session.summary_task
+        if summary_task is not None:
+            summary_task.cancel()
+            await asyncio.gather(summary_task, return_exceptions=True)
+        
+        logger.info(
+            "Session ended: {}, duration={:.1f}s, turns={}",
+            summary["call_control_id"],
+            summary["duration_seconds"],
+            summary["total_turns"],
+        )
+    
+    def _spawn(self, coro: Awaitable[Any]) -> asyncio.Task[Any]:
+        """Run a coroutine in the background, tracked until shutdown."""
+        task = asyncio.ensure_future(coro)
+        self._background.add(task)
+        task.add_done_callback(self._background.discard)
+        return task
+    
     async def generate_greeting(self, session: CallSession) -> bytes:
         """
         Generate greeting audio for new call.
@@ -402,12 +590,11 @@ class PipelineService:
         Returns:
             Greeting audio bytes
         """
-        greeting_text = "مرحباً! أنا سارة من عيادة نكسوس مراكل. كيف أقدر أساعدك اليوم؟"
-        
-        audio = await self._tts.synthesize(greeting_text, Voice.SARA)
+        greeting = self._llm.GREETING_TEXT
+        audio = await self._tts.synthesize(greeting, Voice.SARA)
         
         session.greeting_sent = True
-        session.add_message("sara", greeting_text)
+        session.add_message("sara", greeting)
         
         logger.info("Greeting generated")
         return audio
@@ -437,14 +624,22 @@ class PipelineService:
         for call_id in list(self._sessions.keys()):
             self.end_session(call_id)
         
+        # Stop keep-alive pings
+        if self._keepalive_task is not None:
+            self._keepalive_task.cancel()
+            self._keepalive_task = None
+        self._is_warm = False
+        
+        # Wait for session finalizers (they cancel pending summaries)
+        await asyncio.gather(*self._background, return_exceptions=True)
+        
         # Shutdown services
-        await asyncio.gather(
-            self._vad.shutdown(),
-            self._asr.shutdown(),
-            self._llm.shutdown(),
-            self._tts.shutdown(),
-            self._filler.shutdown(),
-        )
+        async with asyncio.TaskGroup() as tg:
+            tg.create_task(self._vad.shutdown())
+            tg.create_task(self._asr.shutdown())
+            tg.create_task(self._llm.shutdown())
+            tg.create_task(self._tts.shutdown())
+            tg.create_task(self._filler.shutdown())
         
         self._is_initialized = False
         logger.info("PipelineService shutdown")
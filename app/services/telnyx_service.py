@@ -6,12 +6,13 @@ Handles answering, hanging up, and media forking to WebSocket.
 """
 
 import asyncio
-from typing import Any, Optional
+from typing import Any, Coroutine, Optional
 
 import httpx
 from loguru import logger
 
 from app.config import get_settings
+from app.services.http_service import HTTP2_AVAILABLE
 
 
 class TelnyxService:
@@ -26,6 +27,14 @@ class TelnyxService:
     
     BASE_URL = "https://api.telnyx.com/v2"
     
+    # Connection pool shared by all call control actions
+    POOL_LIMITS = httpx.Limits(
+        max_keepalive_connections=50,
+        max_connections=100,
+        keepalive_expiry=300.0,
+    )
+    TIMEOUT = httpx.Timeout(5.0, connect=2.0)
+    
     def __init__(self, api_key: Optional[str] = None) -> None:
         """
         Initialize the Telnyx service.
@@ -39,24 +48,44 @@ class TelnyxService:
         self._client: Optional[httpx.AsyncClient] = None
         self._is_initialized = False
         
+        # Background call control requests awaited on shutdown
+        self._pending: set[asyncio.Task[Any]] = set()
+        
         logger.info("TelnyxService created")
     
     async def initialize(self) -> None:
-        """Initialize the HTTP client."""
+        """
+        Initialize the HTTP client and start warming its connection.
+        
+        The client and flag are set before anything is awaited, so
+        concurrent callers never build a second client; the warm-up
+        request runs in the background.
+        """
         if self._is_initialized:
             return
         
+        self._is_initialized = True
         self._client = httpx.AsyncClient(
             base_url=self.BASE_URL,
             headers={
                 "Authorization": f"Bearer {self._api_key}",
                 "Content-Type": "application/json",
             },
-            timeout=30.0,
+            http2=HTTP2_AVAILABLE,
+            limits=self.POOL_LIMITS,
+            timeout=self.TIMEOUT,
         )
         
-        self._is_initialized = True
-        logger.info("TelnyxService initialized")
+        self.run_in_background(self._warm_connection())
+        
+        logger.info(f"TelnyxService initialized (http2={HTTP2_AVAILABLE})")
+    
+    async def _warm_connection(self) -> None:
+        """Open the pooled connection before the first call action."""
+        try:
+            await self._client.get("/balance")  # type: ignore
+        except httpx.HTTPError as e:
+            logger.debug(f"Telnyx connection warm-up failed: {e}")
     
     async def _ensure_client(self) -> httpx.AsyncClient:
         """Ensure HTTP client is initialized."""
@@ -64,6 +93,32 @@ class TelnyxService:
             await self.initialize()
         return self._client  # type: ignore
     
+    def run_in_background(
+        self,
+        coro: Coroutine[Any, Any, Any],
+    ) -> asyncio.Task[Any]:
+        """
+        Issue a call control request without waiting for its response.
+        
+        Failures are logged; pending requests are awaited on shutdown.
+        
+        Args:
+            coro: Call control coroutine (e.g. hangup_call(...))
+        
+        Returns:
+            The scheduled task
+        """
+        task = asyncio.create_task(coro)
+        self._pending.add(task)
+        task.add_done_callback(self._on_background_done)
+        return task
+    
+    def _on_background_done(self, task: asyncio.Task[Any]) -> None:
+        """Forget a finished background request and log its failure."""
+        self._pending.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            logger.error(f"Background Telnyx request failed: {task.exception()}")
+    
     async def answer_call(
         self,
         call_control_id: str,
@@ -73,6 +128,9 @@ class TelnyxService:
         """
         Answer an incoming call and optionally start media streaming.
         
+        The streaming_start request is issued in the background as soon as
+        the answer succeeds, so the caller does not wait for it.
+        
         Args:
             call_control_id: Telnyx call control ID
             webhook_url: URL for webhook events (optional)
@@ -102,7 +160,9 @@ class TelnyxService:
         
         # Start media streaming if stream URL provided
         if stream_url:
-            await self.start_media_stream(call_control_id, stream_url)
+            self.run_in_background(
+                self.start_media_stream(call_control_id, stream_url)
+            )
         
         return result
     
@@ -326,6 +386,9 @@ class TelnyxService:
     
     async def shutdown(self) -> None:
         """Cleanup resources."""
+        if self._pending:
+            await asyncio.gather(*self._pending, return_exceptions=True)
+        
         if self._client:
             await self._client.aclose()
             self._client = None
@@ -7,14 +7,22 @@ Target: <100ms TTFB (Time to First Byte).
 """
 
 import asyncio
+import base64
+import io
+import json
+import re
 import time
+from collections import OrderedDict
+from dataclasses import dataclass
 from enum import Enum
-from typing import Any, AsyncGenerator
+from typing import Any, AsyncGenerator, AsyncIterator
 
+import websockets
 from loguru import logger
 
 from app.config import get_settings
 from app.exceptions import SynthesisError, TTSException, VoiceNotFoundError
+from app.services.http_service import get_http_client
 
 
 class Voice(str, Enum):
@@ -24,6 +32,55 @@ class Voice(str, Enum):
     NEXUS = "nexus"
 
 
+@dataclass(frozen=True, slots=True)
+class _ResolvedVoice:
+    """Per-voice request arguments, built once at initialization."""
+    
+    voice_id: str
+    request: dict[str, Any]  # convert() kwargs, minus text/output_format
+    stream_request: dict[str, Any]  # stream() kwargs, tuned for latency
+    bos_message: str  # Encoded first frame of an input-stream socket
+
+
+class _ProgressiveEmitter:
+    """
+    Re-chunk a PCM16 stream into small-then-growing frames.
+    
+    The first frame is emitted as soon as 20ms of audio is available and
+    each following frame doubles in size up to 200ms, so playback can start
+    without waiting for the upstream's large first chunk.
+    """
+    
+    FIRST_FRAME_MS = 20
+    MAX_FRAME_MS = 200
+    
+    def __init__(self, sample_rate: int) -> None:
+        self._bytes_per_ms = sample_rate * 2 // 1000
+        self._buffer = bytearray()
+        self._target_ms = self.FIRST_FRAME_MS
+    
+    def feed(self, chunk: bytes) -> list[bytes]:
+        """Add upstream audio and return the frames that are now complete."""
+        self._buffer += chunk
+        frames = []
+        while len(self._buffer) >= (size := self._target_ms * self._bytes_per_ms):
+            frames.append(bytes(self._buffer[:size]))
+            del self._buffer[:size]
+            self._target_ms = min(self._target_ms * 2, self.MAX_FRAME_MS)
+        return frames
+    
+    def flush(self) -> bytes:
+        """Return any remaining buffered audio."""
+        rest = bytes(self._buffer)
+        self.clear()
+        return rest
+    
+    def clear(self) -> None:
+        """Drop buffered audio and restart from the smallest frame size."""
+        self._buffer.clear()
+        self._target_ms = self.FIRST_FRAME_MS
+
+
 class TTSService:
     """
     Text-to-Speech service using ElevenLabs Flash v2.5.
@@ -54,6 +111,28 @@ class TTSService:
         },
     }
     
+    MODEL_ID = "eleven_flash_v2_5"
+    
+    # LRU cache of synthesized audio for short, repeated phrases
+    MAX_CACHED_AUDIO = 256
+    MAX_CACHED_TEXT_CHARS = 400
+    
+    # Incremental-text synthesis endpoint (text in, audio out over one socket)
+    STREAM_INPUT_URL = (
+        "wss://api.elevenlabs.io/v1/text-to-speech/{voice_id}/stream-input"
+        "?model_id={model_id}&output_format={output_format}"
+    )
+    
+    # Characters buffered server-side before each generation is triggered
+    CHUNK_LENGTH_SCHEDULE = [50, 90, 120, 150]
+    
+    # Sentence splitting for REST pipelining (Latin and Arabic punctuation)
+    SENTENCE_END = re.compile(r"[.!?؟،](?:\s|$)")
+    MAX_SENTENCE_WORDS = 80
+    
+    # Concurrent requests when synthesizing several texts in order
+    MAX_PARALLEL_SYNTHESES = 3
+    
     def __init__(self) -> None:
         """Initialize the TTS service."""
         self._settings = get_settings()
@@ -61,12 +140,23 @@ class TTSService:
         self._is_initialized = False
         self._active_voice = Voice.SARA
         
-        # Voice ID cache
-        self._voice_ids: dict[Voice, str] = {}
+        # Configured voices, resolved at initialization
+        self._voices: dict[Voice, _ResolvedVoice] = {}
+        
+        # In-flight syntheses shared by identical concurrent requests
+        self._inflight: dict[tuple[str, Voice, str], asyncio.Task[bytes]] = {}
+        self._waiters: dict[asyncio.Task[bytes], int] = {}
+        
+        # Fire-and-forget cache fills started by prefetch()
+        self._prefetches: set[asyncio.Task[bytes]] = set()
+        
+        # Completed short syntheses: (text, voice, output_format) -> audio
+        self._audio_cache: OrderedDict[tuple[str, Voice, str], bytes] = OrderedDict()
+        self._cache_hits = 0
         
         # Statistics
         self._total_syntheses = 0
-        self._total_ttfb_ms = 0.0
+        self._total_ttfb_ns = 0
         self._total_bytes = 0
         
         logger.info("TTSService created")
@@ -82,7 +172,7 @@ class TTSService:
             return
         
         try:
-            from elevenlabs import ElevenLabs
+            from elevenlabs.client import AsyncElevenLabs
             
             api_key = self._settings.elevenlabs_api_key
             if not api_key:
@@ -91,16 +181,19 @@ class TTSService:
                     details={"setting": "elevenlabs_api_key"},
                 )
             
-            self._client = ElevenLabs(api_key=api_key)
+            # Process-wide pool: TLS sessions and HTTP/2 connections are reused
+            self._client = AsyncElevenLabs(
+                api_key=api_key,
+                httpx_client=get_http_client(),
+            )
             
             # Get voice IDs from settings
             sara_id = self._settings.elevenlabs_voice_sara
             nexus_id = self._settings.elevenlabs_voice_nexus
             
-            if sara_id:
-                self._voice_ids[Voice.SARA] = sara_id
-            if nexus_id:
-                self._voice_ids[Voice.NEXUS] = nexus_id
+            for voice, voice_id in ((Voice.SARA, sara_id), (Voice.NEXUS, nexus_id)):
+                if voice_id:
+                    self._voices[voice] = self._resolve_voice(voice, voice_id)
             
             self._is_initialized = True
             logger.info(
@@ -120,14 +213,59 @@ class TTSService:
                 details={"error": str(e)},
             )
     
-    def _get_voice_id(self, voice: Voice) -> str:
-        """Get ElevenLabs voice ID for a voice."""
-        if voice not in self._voice_ids:
+    def _resolve_voice(self, voice: Voice, voice_id: str) -> _ResolvedVoice:
+        """Build the constant request arguments for a configured voice."""
+        config = self.VOICE_CONFIGS[voice]
+        latency_level = self._settings.elevenlabs_latency_level
+        
+        # Style exaggeration adds generation latency; drop it in low-latency modes
+        stream_style = config.get("style", 0.0)
+        if latency_level >= 3:
+            stream_style = 0.0
+        
+        stream_settings = {
+            "stability": config["stability"],
+            "similarity_boost": config["similarity_boost"],
+            "style": stream_style,
+        }
+        
+        return _ResolvedVoice(
+            voice_id=voice_id,
+            request={
+                "voice_id": voice_id,
+                "model_id": self.MODEL_ID,
+                "voice_settings": {
+                    "stability": config["stability"],
+                    "similarity_boost": config["similarity_boost"],
+                    "style": config.get("style", 0.0),
+                    "use_speaker_boost": True,
+                },
+            },
+            stream_request={
+                "voice_id": voice_id,
+                "model_id": self.MODEL_ID,
+                "optimize_streaming_latency": latency_level,
+                "voice_settings": stream_settings,
+            },
+            bos_message=json.dumps({
+                "text": " ",
+                "voice_settings": stream_settings,
+                "generation_config": {
+                    "chunk_length_schedule": self.CHUNK_LENGTH_SCHEDULE,
+                },
+                "xi_api_key": self._settings.elevenlabs_api_key,
+            }),
+        )
+    
+    def _get_voice(self, voice: Voice) -> _ResolvedVoice:
+        """Get the resolved ElevenLabs voice."""
+        try:
+            return self._voices[voice]
+        except KeyError:
             raise VoiceNotFoundError(
                 message=f"Voice '{voice.value}' not configured",
                 details={"voice": voice.value},
-            )
-        return self._voice_ids[voice]
+            ) from None
     
     async def synthesize(
         self,
@@ -138,6 +276,11 @@ class TTSService:
         """
         Synthesize text to audio.
         
+        Short phrases (greetings, fillers, prompts) are served from an LRU
+        cache once synthesized, and concurrent requests for the same text,
+        voice and format share a single upstream synthesis, which is
+        cancelled once every caller waiting on it has been cancelled.
+        
         Args:
             text: Text to synthesize
             voice: Voice to use (SARA or NEXUS)
@@ -161,34 +304,108 @@ class TTSService:
             logger.warning("TTS client not available")
             return b""
         
-        start_time = time.time()
+        key = (text, voice, output_format)
         
+        audio = self._audio_cache.get(key)
+        if audio is not None:
+            self._audio_cache.move_to_end(key)
+            self._cache_hits += 1
+            return audio
+        
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.create_task(self._synthesize(text, voice, output_format))
+            self._inflight[key] = task
+            task.add_done_callback(lambda t: self._release_inflight(key, t))
+        else:
+            logger.debug(f"Joining in-flight synthesis: {voice.value}, {len(text)} chars")
+        
+        self._waiters[task] = self._waiters.get(task, 0) + 1
         try:
-            voice_id = self._get_voice_id(voice)
-            voice_config = self.VOICE_CONFIGS[voice]
+            # Shield so one caller cancelling does not abort the shared request
+            return await asyncio.shield(task)
+        except asyncio.CancelledError:
+            # Last caller gone (e.g. barge-in): stop the upstream request too
+            if self._waiters[task] == 1:
+                task.cancel()
+            raise
+        finally:
+            self._waiters[task] -= 1
+            if not self._waiters[task]:
+                del self._waiters[task]
+    
+    def prefetch(
+        self,
+        text: str,
+        voice: Voice | str = Voice.SARA,
+        output_format: str = "pcm_16000",
+    ) -> None:
+        """
+        Start synthesizing text without waiting for it.
+        
+        A later synthesize() call for the same text joins the in-flight
+        request or hits the cache. Failures are only logged; that call
+        retries.
+        
+        Args:
+            text: Text to synthesize
+            voice: Voice to use
+            output_format: Audio output format
+        """
+        task = asyncio.create_task(self.synthesize(text, voice, output_format))
+        self._prefetches.add(task)
+        task.add_done_callback(self._prefetch_done)
+    
+    def _prefetch_done(self, task: asyncio.Task[bytes]) -> None:
+        """Forget a finished prefetch, logging its failure if any."""
+        self._prefetches.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            logger.warning(f"TTS prefetch failed: {task.exception()}")
+    
+    def _release_inflight(
+        self,
+        key: tuple[str, Voice, str],
+        task: asyncio.Task[bytes],
+    ) -> None:
+        """Drop a finished synthesis from the in-flight map and cache its audio."""
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        if task.cancelled() or task.exception() is not None:
+            return
+        
+        # Cache short phrases; long dynamic responses are unlikely to repeat
+        audio = task.result()
+        if audio and len(key[0]) <= self.MAX_CACHED_TEXT_CHARS:
+            self._audio_cache[key] = audio
+            if len(self._audio_cache) > self.MAX_CACHED_AUDIO:
+                self._audio_cache.popitem(last=False)
+    
+    async def _synthesize(
+        self,
+        text: str,
+        voice: Voice,
+        output_format: str,
+    ) -> bytes:
+        """Run a single synthesis request against ElevenLabs."""
+        start_ns = time.perf_counter_ns()
+        
+        try:
+            resolved = self._get_voice(voice)
             
             logger.debug(f"Synthesizing {len(text)} chars as {voice.value}")
             
-            # Call ElevenLabs TTS API
-            audio = await asyncio.to_thread(
-                self._client.text_to_speech.convert,
+            # Call ElevenLabs TTS API, collecting the chunked response
+            buffer = io.BytesIO()
+            async for chunk in self._client.text_to_speech.convert(
                 text=text,
-                voice_id=voice_id,
-                model_id="eleven_flash_v2_5",
                 output_format=output_format,
-                voice_settings={
-                    "stability": voice_config["stability"],
-                    "similarity_boost": voice_config["similarity_boost"],
-                    "style": voice_config.get("style", 0.0),
-                    "use_speaker_boost": True,
-                },
-            )
-            
-            # Collect all audio bytes
-            audio_bytes = b"".join(audio) if hasattr(audio, '__iter__') else audio
+                **resolved.request,
+            ):
+                buffer.write(chunk)
+            audio_bytes = buffer.getvalue()
             
             # Log metrics
-            latency_ms = (time.time() - start_time) * 1000
+            latency_ms = (time.perf_counter_ns() - start_ns) / 1e6
             self._total_syntheses += 1
             self._total_bytes += len(audio_bytes)
             
@@ -233,36 +450,41 @@ class TTSService:
         if not self._client:
             return
         
-        start_time = time.time()
-        first_chunk_time = None
+        start_ns = time.perf_counter_ns()
+        ttfb_pending = True
         total_bytes = 0
         
         try:
-            voice_id = self._get_voice_id(voice)
-            voice_config = self.VOICE_CONFIGS[voice]
+            resolved = self._get_voice(voice)
             
-            # Stream from ElevenLabs (convert returns an iterator when streaming)
+            # Stream from ElevenLabs (async iterator over the chunked response)
             audio_stream = self._client.text_to_speech.stream(
                 text=text,
-                voice_id=voice_id,
-                model_id="eleven_flash_v2_5",
                 output_format=output_format,
-                voice_settings={
-                    "stability": voice_config["stability"],
-                    "similarity_boost": voice_config["similarity_boost"],
-                    "style": voice_config.get("style", 0.0),
-                },
+                **resolved.stream_request,
             )
             
-            for chunk in audio_stream:
-                if first_chunk_time is None:
-                    first_chunk_time = time.time()
-                    ttfb_ms = (first_chunk_time - start_time) * 1000
-                    self._total_ttfb_ms += ttfb_ms
-                    logger.debug(f"TTS TTFB: {ttfb_ms:.0f}ms")
+            # Re-chunk PCM progressively; other formats pass through as-is
+            emitter = None
+            if output_format.startswith("pcm_"):
+                emitter = _ProgressiveEmitter(int(output_format.split("_")[1]))
+            
+            async for chunk in audio_stream:
+                if ttfb_pending:
+                    ttfb_pending = False
+                    ttfb_ns = time.perf_counter_ns() - start_ns
+                    self._total_ttfb_ns += ttfb_ns
+                    logger.debug("TTS TTFB: {:.0f}ms", ttfb_ns / 1e6)
                 
                 total_bytes += len(chunk)
-                yield chunk
+                if emitter is None:
+                    yield chunk
+                    continue
+                for frame in emitter.feed(chunk):
+                    yield frame
+            
+            if emitter is not None and (rest := emitter.flush()):
+                yield rest
             
             self._total_syntheses += 1
             self._total_bytes += total_bytes
@@ -277,41 +499,216 @@ class TTSService:
     async def synthesize_with_input_stream(
         self,
         text_stream: AsyncGenerator[str, None],
-        voice: Voice = Voice.SARA,
+        voice: Voice | str = Voice.SARA,
         output_format: str = "pcm_16000",
     ) -> AsyncGenerator[bytes, None]:
         """
         Stream synthesis with streaming text input.
         
-        Lowest latency by starting synthesis before full text available.
+        Text chunks (e.g. LLM tokens) are forwarded over the ElevenLabs
+        stream-input WebSocket as they arrive, so audio starts before the
+        full text is available.
+        
+        Args:
+            text_stream: Async generator yielding text chunks
+            voice: Voice to use
+            output_format: Audio format
+        
+        Yields:
+            Audio byte chunks
         """
         if not self._is_initialized:
             await self.initialize()
         
+        if isinstance(voice, str):
+            voice = Voice(voice.lower())
+        
         if not self._client:
             return
         
+        start_ns = time.perf_counter_ns()
+        ttfb_pending = True
+        total_bytes = 0
+        
         try:
-            voice_id = self._get_voice_id(voice)
-            voice_config = self.VOICE_CONFIGS[voice]
-            
-            # Collect text from stream
-            text_buffer = ""
-            async for text_chunk in text_stream:
-                text_buffer += text_chunk
+            resolved = self._get_voice(voice)
+            url = self.STREAM_INPUT_URL.format(
+                voice_id=resolved.voice_id,
+                model_id=self.MODEL_ID,
+                output_format=output_format,
+            )
             
-            # Synthesize complete text
-            # Note: True input streaming requires ElevenLabs websocket API
-            async for audio_chunk in self.synthesize_stream(
-                text_buffer,
-                voice,
-                output_format,
-            ):
-                yield audio_chunk
+            async with websockets.connect(url) as ws:
+                # Beginning of stream: settings and credentials
+                await ws.send(resolved.bos_message)
+                
+                async def send_text() -> None:
+                    async for text_chunk in text_stream:
+                        if text_chunk:
+                            await ws.send(json.dumps({
+                                "text": text_chunk,
+                                "try_trigger_generation": True,
+                            }))
+                    # End of stream: flush remaining text
+                    await ws.send(json.dumps({"text": ""}))
                 
+                sender = asyncio.create_task(send_text())
+                try:
+                    async for message in ws:
+                        data = json.loads(message)
+                        
+                        if data.get("audio"):
+                            chunk = base64.b64decode(data["audio"])
+                            
+                            if ttfb_pending:
+                                ttfb_pending = False
+                                ttfb_ns = time.perf_counter_ns() - start_ns
+                                self._total_ttfb_ns += ttfb_ns
+                                logger.debug("TTS input-stream TTFB: {:.0f}ms", ttfb_ns / 1e6)
+                            
+                            total_bytes += len(chunk)
+                            yield chunk
+                        
+                        if data.get("isFinal"):
+                            break
+                    
+                    # Surface errors from the text producer
+                    await sender
+                finally:
+                    sender.cancel()
+            
+            self._total_syntheses += 1
+            self._total_bytes += total_bytes
+            
+        except VoiceNotFoundError:
+            raise
         except Exception as e:
             logger.error(f"Input stream synthesis failed: {e}")
-            raise
+            raise SynthesisError(
+                message="TTS input streaming failed",
+                details={"error": str(e)},
+            )
+    
+    async def synthesize_sentences(
+        self,
+        text_stream: AsyncGenerator[str, None],
+        voice: Voice | str = Voice.SARA,
+        output_format: str = "pcm_16000",
+    ) -> AsyncGenerator[bytes, None]:
+        """
+        Synthesize streamed text sentence by sentence over REST.
+        
+        Each complete sentence is synthesized as soon as it arrives, while
+        later text is still being generated. Audio is yielded in sentence
+        order.
+        
+        Args:
+            text_stream: Async generator yielding text chunks (e.g. LLM tokens)
+            voice: Voice to use
+            output_format: Audio format
+        
+        Yields:
+            Audio bytes, one item per sentence
+        """
+        async def split_sentences() -> AsyncGenerator[str, None]:
+            buffer = ""
+            async for text_chunk in text_stream:
+                buffer += text_chunk
+                while match := self.SENTENCE_END.search(buffer):
+                    yield buffer[:match.end()]
+                    buffer = buffer[match.end():]
+                if len(buffer.split()) >= self.MAX_SENTENCE_WORDS:
+                    yield buffer
+                    buffer = ""
+            yield buffer
+        
+        async def sentences() -> AsyncGenerator[tuple[str, Voice | str], None]:
+            async for sentence in split_sentences():
+                yield sentence, voice
+        
+        async for audio in self._synthesize_ordered(sentences(), output_format):
+            yield audio
+    
+    async def synthesize_many(
+        self,
+        segments: list[tuple[str, Voice | str]],
+        output_format: str = "pcm_16000",
+    ) -> AsyncGenerator[bytes, None]:
+        """
+        Synthesize several segments concurrently, yielding them in order.
+        
+        Args:
+            segments: (text, voice) pairs to synthesize; blank texts are skipped
+            output_format: Audio format
+        
+        Yields:
+            Audio bytes, one item per non-blank segment
+        """
+        async def iterate() -> AsyncGenerator[tuple[str, Voice | str], None]:
+            for segment in segments:
+                yield segment
+        
+        async for audio in self._synthesize_ordered(iterate(), output_format):
+            yield audio
+    
+    async def _synthesize_ordered(
+        self,
+        texts: AsyncIterator[tuple[str, Voice | str]],
+        output_format: str,
+    ) -> AsyncGenerator[bytes, None]:
+        """
+        Submit (text, voice) pairs for synthesis as they arrive and yield
+        audio in order.
+        
+        At most MAX_PARALLEL_SYNTHESES requests run at once; blank texts
+        are skipped.
+        """
+        semaphore = asyncio.Semaphore(self.MAX_PARALLEL_SYNTHESES)
+        pending: asyncio.Queue[asyncio.Task[bytes] | None] = asyncio.Queue()
+        
+        async def synthesize_one(text: str, voice: Voice | str) -> bytes:
+            async with semaphore:
+                return await self.synthesize(text, voice, output_format)
+        
+        async def submit() -> None:
+            try:
+                async for text, voice in texts:
+                    text = text.strip()
+                    if text:
+                        pending.put_nowait(asyncio.create_task(synthesize_one(text, voice)))
+            finally:
+                pending.put_nowait(None)
+        
+        submitter = asyncio.create_task(submit())
+        try:
+            while (task := await pending.get()) is not None:
+                yield await task
+            
+            # Surface errors from the text source
+            await submitter
+        finally:
+            submitter.cancel()
+            while not pending.empty():
+                task = pending.get_nowait()
+                if task is not None:
+                    task.cancel()
+    
+    async def warmup(self) -> bool:
+        """
+        Open the HTTPS connection to ElevenLabs with a cheap request.
+        
+        Returns:
+            True if the connection is warm
+        """
+        if not self._client:
+            return False
+        
+        try:
+            await self._client.models.get_all()
+            return True
+        except Exception as e:
+            logger.debug(f"TTS warm-up failed: {e}")
+            return False
     
     def switch_voice(self, new_voice: Voice) -> None:
         """Switch the active voice."""
@@ -329,16 +726,27 @@ class TTSService:
         """Get TTS performance statistics."""
         avg_ttfb = 0.0
         if self._total_syntheses > 0:
-            avg_ttfb = self._total_ttfb_ms / self._total_syntheses
+            avg_ttfb = self._total_ttfb_ns / self._total_syntheses / 1e6
         
         return {
             "total_syntheses": self._total_syntheses,
             "average_ttfb_ms": avg_ttfb,
             "total_bytes": self._total_bytes,
+            "cache_hits": self._cache_hits,
+            "cached_phrases": len(self._audio_cache),
         }
     
     async def shutdown(self) -> None:
         """Cleanup resources."""
+        for task in [*self._prefetches, *self._inflight.values()]:
+            task.cancel()
+        await asyncio.gather(
+            *self._prefetches, *self._inflight.values(), return_exceptions=True
+        )
+        self._prefetches.clear()
+        self._inflight.clear()
+        self._audio_cache.clear()
+        
         self._is_initialized = False
         self._client = None
         logger.info("TTSService shutdown")
@@ -6,8 +6,13 @@ Detects speech segments in real-time audio streams.
 Target: <5ms per chunk processing.
 """
 
+import asyncio
+import audioop
+import importlib.util
+from concurrent.futures import ThreadPoolExecutor
 from enum import Enum
-from typing import Any
+from pathlib import Path
+from typing import Any, Iterator
 
 import numpy as np
 from loguru import logger
@@ -15,6 +20,9 @@ from loguru import logger
 from app.config import get_settings
 from app.exceptions import VADException, VADInitializationError
 
+# Imported in _load_session; onnxruntime is slow to import and unused without a model
+ONNXRUNTIME_AVAILABLE = importlib.util.find_spec("onnxruntime") is not None
+
 
 class VADEvent(str, Enum):
     """VAD state events."""
@@ -25,6 +33,154 @@ class VADEvent(str, Enum):
     SILENCE = "silence"
 
 
+# Events during which the caller is speaking
+_SPEECH_EVENTS = frozenset({VADEvent.SPEECH_START, VADEvent.SPEECH_CONTINUE})
+
+# Prebuilt PCM sample dtype (skips dtype parsing on every chunk)
+_INT16 = np.dtype(np.int16)
+
+
+class VADBatcher:
+    """
+    Micro-batch Silero windows from concurrent call streams.
+    
+    Windows submitted within MAX_WAIT_MS of the first queued one (up to
+    MAX_BATCH) are stacked along the batch axis, each with its own
+    recurrent state, and run through ONNX Runtime in a single call.
+    
+    With a GPU session, batches of at least GPU_MIN_BATCH windows run on
+    it; smaller ones stay on CPU, where a single window is cheaper than
+    the host-device round trip.
+    
+    Inference runs on a dedicated worker thread (ONNX Runtime releases the
+    GIL), so the event loop keeps serving calls while a batch runs.
+    """
+    
+    MAX_BATCH = 16
+    MAX_WAIT_MS = 5
+    GPU_MIN_BATCH = 4
+    
+    def __init__(self, session: Any, sample_rate: int, gpu_session: Any = None) -> None:
+        self._session = session
+        self._gpu_session = gpu_session
+        self._sr = np.array(sample_rate, dtype=np.int64)
+        self._queue: asyncio.Queue[tuple[np.ndarray, np.ndarray, asyncio.Future]] = (
+            asyncio.Queue()
+        )
+        self._task: asyncio.Task[None] | None = None
+        self._executor: ThreadPoolExecutor | None = None
+    
+    @property
+    def is_running(self) -> bool:
+        """Whether the batching loop is accepting windows."""
+        return self._task is not None
+    
+    def start(self) -> None:
+        """Start the batching loop."""
+        if self._task is None:
+            self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="vad")
+            self._task = asyncio.create_task(self._run())
+    
+    async def stop(self) -> None:
+        """Stop the batching loop and fail any queued windows."""
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+        
+        while not self._queue.empty():
+            self._fail([self._queue.get_nowait()], VADException(message="VAD batcher stopped"))
+    
+    async def submit(
+        self,
+        model_input: np.ndarray,
+        state: np.ndarray,
+    ) -> tuple[float, np.ndarray]:
+        """
+        Queue one window for the next batch.
+        
+        Args:
+            model_input: Float32 [context | window] input, shape (1, N)
+            state: Stream's recurrent state, shape (2, 1, 128)
+        
+        Returns:
+            Speech probability and the stream's updated state
+        """
+        future: asyncio.Future[tuple[float, np.ndarray]] = (
+            asyncio.get_running_loop().create_future()
+        )
+        self._queue.put_nowait((model_input, state, future))
+        return await future
+    
+    async def _run(self) -> None:
+        """Collect queued windows into batches until cancelled."""
+        queue = self._queue
+        while True:
+            batch = [await queue.get()]
+            await asyncio.sleep(self.MAX_WAIT_MS / 1000)
+            while len(batch) < self.MAX_BATCH and not queue.empty():
+                batch.append(queue.get_nowait())
+            await self._run_batch(batch)
+    
+    async def _run_batch(
+        self,
+        batch: list[tuple[np.ndarray, np.ndarray, asyncio.Future]],
+    ) -> None:
+        """Run one stacked inference off the loop and resolve each window's future."""
+        session = self._session
+        if self._gpu_session is not None and len(batch) >= self.GPU_MIN_BATCH:
+            session = self._gpu_session
+        
+        try:
+            output, states = await asyncio.get_running_loop().run_in_executor(
+                self._executor,
+                self._infer,
+                session,
+                [item[0] for item in batch],
+                [item[1] for item in batch],
+            )
+        except asyncio.CancelledError:
+            self._fail(batch, VADException(message="VAD batcher stopped"))
+            raise
+        except Exception as e:
+            self._fail(batch, e)
+            return
+        
+        for i, (_, _, future) in enumerate(batch):
+            if not future.done():
+                future.set_result((float(output[i, 0]), states[:, i:i + 1]))
+    
+    def _infer(
+        self,
+        session: Any,
+        inputs: list[np.ndarray],
+        states: list[np.ndarray],
+    ) -> list[np.ndarray]:
+        """Stack the windows and run the model (worker thread)."""
+        return session.run(
+            None,
+            {
+                "input": np.concatenate(inputs),
+                "state": np.concatenate(states, axis=1),
+                "sr": self._sr,
+            },
+        )
+    
+    @staticmethod
+    def _fail(
+        batch: list[tuple[np.ndarray, np.ndarray, asyncio.Future]],
+        error: Exception,
+    ) -> None:
+        """Fail every still-pending window in a batch."""
+        for _, _, future in batch:
+            if not future.done():
+                future.set_exception(error)
+
+
 class VADService:
     """
     Voice Activity Detection service using Silero VAD.
@@ -37,19 +193,38 @@ class VADService:
     Target latency: <5ms per audio chunk.
     """
     
+    # Silero v5 at 16kHz: fixed 512-sample windows plus 64 samples of context
+    WINDOW_SAMPLES = 512
+    CONTEXT_SAMPLES = 64
+    
+    # int16 -> [-1, 1) scale; a power of two, so multiplying is exact
+    INT16_SCALE = np.float32(1.0 / 32768.0)
+    
+    # Dynamically quantized model written by scripts/quantize_vad.py
+    INT8_MODEL_PATH = Path("data/silero_vad_int8.onnx")
+    
     def __init__(self) -> None:
         """Initialize the VAD service."""
         self._settings = get_settings()
-        self._model: Any = None
-        self._vad_iterator: Any = None
+        self._session: Any = None
+        self._batcher: VADBatcher | None = None
         self._is_initialized = False
         
+        # Service a per-call stream was created from; owns the batcher
+        self._parent: VADService | None = None
+        
+        # Concurrent first calls must not each load a model
+        self._init_lock = asyncio.Lock()
+        
         # VAD configuration
         self._sample_rate = 16000  # Silero expects 16kHz
         self._threshold = self._settings.vad_threshold
         self._min_silence_ms = self._settings.vad_min_silence_ms
         self._min_speech_ms = 250  # Minimum speech duration
         
+        # End-of-speech threshold in samples, so the per-frame check is integer-only
+        self._min_silence_samples = self._min_silence_ms * self._sample_rate // 1000
+        
         # Tracking state
         self._is_speaking = False
         self._speech_start_sample = 0
@@ -61,6 +236,16 @@ class VADService:
         self._audio_buffer: list[np.ndarray] = []
         self._buffer_samples = 0
         
+        # Model state carried across windows; input is [context | window]
+        self._state = np.zeros((2, 1, 128), dtype=np.float32)
+        self._input = np.zeros(
+            (1, self.CONTEXT_SAMPLES + self.WINDOW_SAMPLES), dtype=np.float32
+        )
+        self._sr = np.array(self._sample_rate, dtype=np.int64)
+        self._window = np.zeros(self.WINDOW_SAMPLES, dtype=np.int16)
+        self._window_fill = 0
+        self._last_speech_prob = 0.0
+        
         logger.info("VADService created")
     
     async def initialize(self) -> None:
@@ -73,42 +258,43 @@ class VADService:
         if self._is_initialized:
             return
         
+        async with self._init_lock:
+            if not self._is_initialized:
+                await self._initialize()
+    
+    async def _initialize(self) -> None:
+        """Load the model; called once under the init lock."""
+        if not ONNXRUNTIME_AVAILABLE:
+            # Fallback to energy-based VAD if ONNX Runtime not available
+            logger.warning("onnxruntime not available, using energy-based VAD fallback")
+            self._is_initialized = True
+            return
+        
+        model_path = self._resolve_model_path()
+        if model_path is None:
+            logger.warning("Silero VAD model not found, using energy-based VAD fallback")
+            self._is_initialized = True
+            return
+        
+        # Quantization can shift probabilities; allow a separate threshold
+        if model_path.stem.endswith("_int8") and self._settings.vad_threshold_int8 is not None:
+            self._threshold = self._settings.vad_threshold_int8
+        
         try:
-            import torch
-            
-            # Load Silero VAD model
-            self._model, utils = torch.hub.load(
-                repo_or_dir='snakers4/silero-vad',
-                model='silero_vad',
-                force_reload=False,
-                trust_repo=True,
-            )
-            self._model.eval()
-            
-            # Get helper functions
-            self._get_speech_timestamps = utils[0]
-            
-            # Create VAD iterator for streaming
-            from silero_vad import VADIterator
-            self._vad_iterator = VADIterator(
-                self._model,
-                threshold=self._threshold,
-                sampling_rate=self._sample_rate,
-                min_silence_duration_ms=self._min_silence_ms,
-                speech_pad_ms=30,
-            )
+            self._session = await asyncio.to_thread(self._load_session, model_path)
+            gpu_session = None
+            if self._settings.vad_use_gpu:
+                gpu_session = await asyncio.to_thread(self._load_gpu_session, model_path)
+            self._batcher = VADBatcher(self._session, self._sample_rate, gpu_session)
+            self._batcher.start()
             
             self._is_initialized = True
             logger.info(
-                f"VADService initialized: threshold={self._threshold}, "
-                f"min_silence={self._min_silence_ms}ms"
+                f"VADService initialized: model={model_path.name}, "
+                f"gpu={gpu_session is not None}, "
+                f"threshold={self._threshold}, min_silence={self._min_silence_ms}ms"
             )
             
-        except ImportError as e:
-            # Fallback to energy-based VAD if Silero not available
-            logger.warning(f"Silero VAD not available, using energy-based fallback: {e}")
-            self._is_initialized = True
-            
         except Exception as e:
             logger.error(f"Failed to initialize VAD service: {e}")
             raise VADInitializationError(
@@ -116,6 +302,82 @@ class VADService:
                 details={"error": str(e)},
             )
     
+    def _resolve_model_path(self) -> Path | None:
+        """Locate the Silero ONNX model (configured, INT8, or silero-vad package data)."""
+        if self._settings.vad_model_path:
+            path = Path(self._settings.vad_model_path)
+            return path if path.is_file() else None
+        
+        if self.INT8_MODEL_PATH.is_file():
+            return self.INT8_MODEL_PATH
+        
+        return self._package_model_path()
+    
+    @staticmethod
+    def _package_model_path() -> Path | None:
+        """Locate the float Silero ONNX model shipped in the silero-vad package."""
+        # Locate the package without importing it (its __init__ pulls in torch)
+        spec = importlib.util.find_spec("silero_vad")
+        if spec is None or spec.origin is None:
+            return None
+        path = Path(spec.origin).parent / "data" / "silero_vad.onnx"
+        return path if path.is_file() else None
+    
+    def _load_session(
+        self,
+        model_path: Path,
+        providers: list[Any] | None = None,
+    ) -> Any:
+        """Create the ONNX Runtime session and run one warm-up window."""
+        import onnxruntime as ort
+        
+        options = ort.SessionOptions()
+        options.intra_op_num_threads = 1
+        options.inter_op_num_threads = 1
+        options.execution_mode = ort.ExecutionMode.ORT_SEQUENTIAL
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        
+        session = ort.InferenceSession(
+            str(model_path),
+            options,
+            providers=providers or ["CPUExecutionProvider"],
+        )
+        session.run(None, {"input": self._input, "state": self._state, "sr": self._sr})
+        return session
+    
+    def _load_gpu_session(self, model_path: Path) -> Any:
+        """Create a CUDA session for batched inference, or None without CUDA."""
+        import onnxruntime as ort
+        
+        if "CUDAExecutionProvider" not in ort.get_available_providers():
+            logger.warning("vad_use_gpu set but CUDAExecutionProvider unavailable, using CPU")
+            return None
+        
+        return self._load_session(
+            model_path,
+            providers=[("CUDAExecutionProvider", {"device_id": 0}), "CPUExecutionProvider"],
+        )
+    
+    async def create_stream(self) -> "VADService":
+        """
+        Create a VAD for one call, with its own speech and model state.
+        
+        Initializes this service first if needed. Streams share its model
+        session and batcher, so concurrent calls are batched together in
+        process_audio, and a stream never loads a model of its own.
+        
+        Returns:
+            Initialized per-call VADService
+        """
+        await self.initialize()
+        
+        stream = VADService()
+        stream._parent = self
+        stream._session = self._session
+        stream._threshold = self._threshold
+        stream._is_initialized = self._is_initialized
+        return stream
+    
     def reset(self) -> None:
         """Reset VAD state for new audio stream."""
         self._is_speaking = False
@@ -126,36 +388,39 @@ class VADService:
         self._audio_buffer.clear()
         self._buffer_samples = 0
         
-        if self._vad_iterator:
-            self._vad_iterator.reset_states()
+        self._state.fill(0.0)
+        self._input.fill(0.0)
+        self._window_fill = 0
+        self._last_speech_prob = 0.0
         
         logger.debug("VAD state reset")
     
-    def process_chunk(self, audio_chunk: bytes | np.ndarray) -> VADEvent:
+    def process_chunk(self, audio_chunk: bytes | memoryview | np.ndarray) -> VADEvent:
         """
         Process a single audio chunk and return VAD event.
         
         Args:
-            audio_chunk: Raw audio bytes (16-bit PCM) or numpy array
+            audio_chunk: Raw audio bytes or memoryview (16-bit PCM), or numpy array
         
         Returns:
             VADEvent indicating the current speech state
         """
-        # Convert to numpy if needed
-        if isinstance(audio_chunk, bytes):
-            audio = np.frombuffer(audio_chunk, dtype=np.int16)
-        else:
-            audio = audio_chunk
-        
-        # Convert to float32 normalized
-        audio_float = audio.astype(np.float32) / 32768.0
-        
-        # Get speech probability
-        speech_prob = self._get_speech_probability(audio_float)
+        audio = self._as_int16(audio_chunk)
+        return self._update_state(self._get_speech_probability(audio), len(audio))
+    
+    @staticmethod
+    def _as_int16(audio_chunk: bytes | memoryview | np.ndarray) -> np.ndarray:
+        """View audio as int16 samples without copying."""
+        if isinstance(audio_chunk, np.ndarray):
+            return np.ascontiguousarray(audio_chunk, dtype=_INT16)
+        return np.frombuffer(audio_chunk, dtype=_INT16)
+    
+    def _update_state(self, speech_prob: float, chunk_samples: int) -> VADEvent:
+        """Advance the speech state machine by one chunk."""
+        self._last_speech_prob = speech_prob
         is_speech = speech_prob >= self._threshold
         
         # Update sample counts
-        chunk_samples = len(audio_float)
         self._total_samples_processed += chunk_samples
         
         # State machine
@@ -176,16 +441,14 @@ class VADService:
             
             if self._is_speaking:
                 # Check if silence exceeds threshold
-                silence_ms = (self._silence_samples / self._sample_rate) * 1000
-                
-                if silence_ms >= self._min_silence_ms:
+                if self._silence_samples >= self._min_silence_samples:
                     # Speech ended
                     self._is_speaking = False
-                    speech_duration_ms = (self._speech_samples / self._sample_rate) * 1000
                     
                     logger.debug(
-                        f"Speech ended: duration={speech_duration_ms:.0f}ms, "
-                        f"silence={silence_ms:.0f}ms"
+                        "Speech ended: duration={:.0f}ms, silence={:.0f}ms",
+                        self._speech_samples * 1000 / self._sample_rate,
+                        self._silence_samples * 1000 / self._sample_rate,
                     )
                     
                     # Reset speech counter
@@ -197,68 +460,119 @@ class VADService:
             
             return VADEvent.SILENCE
     
-    def _get_speech_probability(self, audio_float: np.ndarray) -> float:
+    def _get_speech_probability(self, audio: np.ndarray) -> float:
         """
         Get speech probability for audio chunk.
         
         Args:
-            audio_float: Float32 audio array (-1 to 1)
+            audio: Int16 audio samples
         
         Returns:
             Speech probability (0 to 1)
         """
-        if self._model is not None:
+        if self._session is not None:
             try:
-                import torch
-                
-                # Ensure correct sample count (512 samples = 32ms at 16kHz)
-                audio_tensor = torch.from_numpy(audio_float)
-                
-                with torch.no_grad():
-                    speech_prob = self._model(audio_tensor, self._sample_rate).item()
-                
-                return speech_prob
-                
+                return self._run_model(audio)
             except Exception as e:
                 logger.warning(f"Silero VAD inference failed: {e}")
         
-        # Fallback: energy-based detection
-        energy = np.sqrt(np.mean(audio_float ** 2))
+        return self._energy_probability(audio)
+    
+    @staticmethod
+    def _energy_probability(audio: np.ndarray) -> float:
+        """Fallback: energy-based detection, RMS computed on the int16 samples."""
+        rms = audioop.rms(audio, 2)
         # Convert RMS to pseudo-probability
-        speech_prob = min(energy * 10, 1.0)
-        return speech_prob
+        return min(rms * 10 / 32768.0, 1.0)
     
-    async def process_audio(self, audio_bytes: bytes) -> dict[str, Any]:
+    def _windows(self, audio: np.ndarray) -> Iterator[np.ndarray]:
         """
-        Process an audio chunk and return VAD results.
+        Gather samples into 512-sample windows.
+        
+        Yields the model input each time a window completes; leftover
+        samples are kept for the next chunk.
+        """
+        window = self._window
+        model_input = self._input
+        
+        offset = 0
+        while offset < len(audio):
+            take = min(self.WINDOW_SAMPLES - self._window_fill, len(audio) - offset)
+            window[self._window_fill:self._window_fill + take] = audio[offset:offset + take]
+            self._window_fill += take
+            offset += take
+            
+            if self._window_fill < self.WINDOW_SAMPLES:
+                return
+            
+            # Previous window's tail becomes this window's context
+            model_input[0, :self.CONTEXT_SAMPLES] = model_input[0, -self.CONTEXT_SAMPLES:]
+            np.multiply(window, self.INT16_SCALE, out=model_input[0, self.CONTEXT_SAMPLES:])
+            self._window_fill = 0
+            yield model_input
+    
+    def _run_model(self, audio: np.ndarray) -> float:
+        """Run Silero directly; the chunk's probability is its loudest window."""
+        speech_prob = None
+        for model_input in self._windows(audio):
+            output, self._state = self._session.run(
+                None,
+                {"input": model_input, "state": self._state, "sr": self._sr},
+            )
+            prob = float(output[0, 0])
+            speech_prob = prob if speech_prob is None else max(speech_prob, prob)
+        
+        # No window completed: carry the previous probability over
+        return self._last_speech_prob if speech_prob is None else speech_prob
+    
+    def _active_batcher(self) -> VADBatcher | None:
+        """The shared batcher (owned by the parent for streams), if running."""
+        owner = self._parent or self
+        batcher = owner._batcher
+        if batcher is None or not batcher.is_running:
+            return None
+        return batcher
+    
+    async def _run_model_batched(self, batcher: VADBatcher, audio: np.ndarray) -> float:
+        """Run Silero through the shared batcher (see _run_model)."""
+        speech_prob = None
+        try:
+            for model_input in self._windows(audio):
+                prob, self._state = await batcher.submit(model_input, self._state)
+                speech_prob = prob if speech_prob is None else max(speech_prob, prob)
+        except Exception as e:
+            logger.warning(f"Batched Silero VAD inference failed: {e}")
+            return self._energy_probability(audio)
+        
+        return self._last_speech_prob if speech_prob is None else speech_prob
+    
+    async def process_audio_event(self, audio_bytes: bytes) -> VADEvent:
+        """
+        Process an audio chunk and return only the VAD event.
+        
+        Hot-path variant of process_audio; the speaking state is
+        available afterwards through the is_speaking property.
         
         Args:
             audio_bytes: Raw audio bytes (16-bit PCM)
         
         Returns:
-            VAD result with speech probability and state
+            VADEvent for this chunk
         """
         if not self._is_initialized:
             await self.initialize()
         
         try:
-            # Get event
-            event = self.process_chunk(audio_bytes)
+            audio = self._as_int16(audio_bytes)
             
-            # Compute metrics
-            audio = np.frombuffer(audio_bytes, dtype=np.int16)
-            audio_float = audio.astype(np.float32) / 32768.0
-            speech_prob = self._get_speech_probability(audio_float)
+            # Batch model inference with other calls when available
+            batcher = self._active_batcher()
+            if batcher is not None:
+                speech_prob = await self._run_model_batched(batcher, audio)
+            else:
+                speech_prob = self._get_speech_probability(audio)
             
-            return {
-                "event": event,
-                "speech_probability": speech_prob,
-                "is_speech": event in (VADEvent.SPEECH_START, VADEvent.SPEECH_CONTINUE),
-                "is_speaking": self._is_speaking,
-                "speech_ended": event == VADEvent.SPEECH_END,
-                "silence_ms": (self._silence_samples / self._sample_rate) * 1000,
-                "speech_ms": (self._speech_samples / self._sample_rate) * 1000,
-            }
+            return self._update_state(speech_prob, len(audio))
             
         except Exception as e:
             logger.error(f"VAD processing failed: {e}")
@@ -267,6 +581,33 @@ class VADService:
                 details={"error": str(e)},
             )
     
+    async def process_audio(self, audio_bytes: bytes) -> dict[str, Any]:
+        """
+        Process an audio chunk and return VAD results.
+        
+        Args:
+            audio_bytes: Raw audio bytes (16-bit PCM)
+        
+        Returns:
+            VAD result with speech probability and state
+        """
+        event = await self.process_audio_event(audio_bytes)
+        
+        return {
+            "event": event,
+            "speech_probability": self._last_speech_prob,
+            "is_speech": event in _SPEECH_EVENTS,
+            "is_speaking": self._is_speaking,
+            "speech_ended": event == VADEvent.SPEECH_END,
+            "silence_ms": (self._silence_samples / self._sample_rate) * 1000,
+            "speech_ms": (self._speech_samples / self._sample_rate) * 1000,
+        }
+    
+    @property
+    def is_speaking(self) -> bool:
+        """Whether the stream is currently inside an utterance."""
+        return self._is_speaking
+    
     async def is_speech(self, audio_bytes: bytes) -> bool:
         """
         Quick check if audio contains speech.
@@ -277,8 +618,7 @@ class VADService:
         Returns:
             True if speech detected, False otherwise
         """
-        result = await self.process_audio(audio_bytes)
-        return result["is_speech"]
+        return await self.process_audio_event(audio_bytes) in _SPEECH_EVENTS
     
     async def detect_end_of_speech(self, audio_bytes: bytes) -> bool:
         """
@@ -290,8 +630,7 @@ class VADService:
         Returns:
             True if speech has ended, False otherwise
         """
-        result = await self.process_audio(audio_bytes)
-        return result["speech_ended"]
+        return await self.process_audio_event(audio_bytes) is VADEvent.SPEECH_END
     
     def get_current_state(self) -> dict[str, Any]:
         """Get current VAD state."""
@@ -305,9 +644,12 @@ class VADService:
     
     async def shutdown(self) -> None:
         """Cleanup resources."""
+        if self._batcher is not None:
+            await self._batcher.stop()
+            self._batcher = None
+        
         self._is_initialized = False
-        self._model = None
-        self._vad_iterator = None
+        self._session = None
         self.reset()
         logger.info("VADService shutdown")
 
@@ -4,9 +4,10 @@ Nexus Miracle - Utilities Package
 Utility modules for the Nexus Miracle application.
 """
 
-from app.utils.audio_buffer import AudioBuffer, PlaybackQueue
+from app.utils.audio_buffer import AudioBuffer, PCMRingBuffer, PlaybackQueue
 
 __all__ = [
     "AudioBuffer",
+    "PCMRingBuffer",
     "PlaybackQueue",
 ]
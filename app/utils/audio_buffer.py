@@ -6,9 +6,11 @@ Used to collect audio during speech until VAD detects end of speech.
 """
 
 import asyncio
+from collections import deque
 from dataclasses import dataclass, field
 from typing import Optional
 
+import numpy as np
 from loguru import logger
 
 
@@ -21,8 +23,7 @@ class AudioBuffer:
     the complete audio for ASR processing.
     """
     
-    chunks: list[bytes] = field(default_factory=list)
-    total_bytes: int = 0
+    data: bytearray = field(default_factory=bytearray)
     sample_rate: int = 16000
     bytes_per_sample: int = 2  # 16-bit audio
     
@@ -34,8 +35,7 @@ class AudioBuffer:
             chunk: Raw audio bytes
             duration_ms: Duration of the chunk in milliseconds
         """
-        self.chunks.append(chunk)
-        self.total_bytes += len(chunk)
+        self.data.extend(chunk)
     
     def get_all_and_clear(self) -> bytes:
         """
@@ -44,20 +44,35 @@ class AudioBuffer:
         Returns:
             Concatenated audio bytes from all chunks
         """
-        if not self.chunks:
+        if not self.data:
             return b""
         
-        all_audio = b"".join(self.chunks)
-        total_bytes = self.total_bytes
+        all_audio = bytes(self.data)
         
         # Clear buffer
-        self.chunks.clear()
-        self.total_bytes = 0
+        self.data.clear()
         
-        logger.debug(f"Buffer flushed: {total_bytes} bytes")
+        logger.debug(f"Buffer flushed: {len(all_audio)} bytes")
         
         return all_audio
     
+    def get_view(self) -> memoryview:
+        """
+        Get a zero-copy view of the buffered audio.
+        
+        The view must be released before more audio is added or the
+        buffer is cleared (a bytearray cannot resize while exported).
+        
+        Returns:
+            Read-only view of the accumulated audio bytes
+        """
+        return memoryview(self.data).toreadonly()
+    
+    @property
+    def total_bytes(self) -> int:
+        """Get the number of buffered audio bytes."""
+        return len(self.data)
+    
     def get_duration_ms(self) -> float:
         """
         Get total duration of buffered audio in milliseconds.
@@ -70,12 +85,100 @@ class AudioBuffer:
     
     def is_empty(self) -> bool:
         """Check if buffer is empty."""
-        return len(self.chunks) == 0
+        return not self.data
     
     def clear(self) -> None:
         """Clear the buffer without returning data."""
-        self.chunks.clear()
-        self.total_bytes = 0
+        self.data.clear()
+
+
+class PCMRingBuffer:
+    """
+    Fixed-capacity ring buffer of 16-bit PCM samples.
+    
+    Storage is allocated once per call. Chunks are written
+    sequentially into it and snapshot() returns a view of the buffered
+    utterance, so handing it to ASR does not copy the audio. When full,
+    the oldest samples are overwritten, with a warning logged once per
+    utterance.
+    """
+    
+    def __init__(self, capacity_samples: int = 16000 * 30) -> None:
+        """
+        Initialize the ring buffer.
+        
+        Args:
+            capacity_samples: Maximum samples held (default: 30s at 16kHz)
+        """
+        self._data = np.zeros(capacity_samples, dtype=np.int16)
+        self._capacity = capacity_samples
+        self._write_idx = 0
+        self._size = 0
+        self._overflowed = False
+    
+    def write(self, chunk: bytes | bytearray | memoryview) -> None:
+        """
+        Append a chunk of 16-bit PCM audio.
+        
+        Args:
+            chunk: Raw PCM bytes (little-endian int16)
+        """
+        samples = np.frombuffer(chunk, dtype=np.int16)
+        n = len(samples)
+        capacity = self._capacity
+        
+        if self._size + n > capacity and not self._overflowed:
+            self._overflowed = True
+            logger.warning(
+                f"PCMRingBuffer full ({capacity} samples); "
+                "dropping the start of the utterance"
+            )
+        
+        if n >= capacity:
+            self._data[:] = samples[-capacity:]
+            self._write_idx = 0
+            self._size = capacity
+            return
+        
+        start = self._write_idx
+        end = start + n
+        if end <= capacity:
+            self._data[start:end] = samples
+        else:
+            split = capacity - start
+            self._data[start:] = samples[:split]
+            self._data[:n - split] = samples[split:]
+        
+        self._write_idx = end % capacity
+        self._size = min(self._size + n, capacity)
+    
+    def snapshot(self) -> np.ndarray:
+        """
+        Get the buffered samples in order.
+        
+        Returns:
+            int16 array; a view into the buffer unless the data wraps
+        """
+        start = (self._write_idx - self._size) % self._capacity
+        end = start + self._size
+        if end <= self._capacity:
+            return self._data[start:end]
+        return np.concatenate((self._data[start:], self._data[:self._write_idx]))
+    
+    def clear(self) -> None:
+        """Discard buffered samples; the next write starts at the front."""
+        self._write_idx = 0
+        self._size = 0
+        self._overflowed = False
+    
+    def __len__(self) -> int:
+        """Get number of buffered samples."""
+        return self._size
+    
+    @property
+    def nbytes(self) -> int:
+        """Get number of buffered bytes."""
+        return self._size * 2
 
 
 class PlaybackQueue:
@@ -92,7 +195,9 @@ class PlaybackQueue:
         Args:
             chunk_size: Size of each audio chunk in samples
         """
-        self._queue: asyncio.Queue[bytes] = asyncio.Queue()
+        # Single consumer: a deque plus wake-up event is enough (no Queue futures)
+        self._chunks: deque[memoryview] = deque()
+        self._not_empty = asyncio.Event()
         self._chunk_size = chunk_size
         self._is_playing = False
     
@@ -100,7 +205,9 @@ class PlaybackQueue:
         """
         Add audio to the playback queue.
         
-        Splits audio into chunks for streaming.
+        Splits audio into chunks for streaming. Chunks are zero-copy
+        views into ``audio``; the only copy happens when they are encoded
+        for sending.
         
         Args:
             audio: Audio bytes to queue
@@ -108,15 +215,17 @@ class PlaybackQueue:
         # Split into 20ms chunks for streaming
         # At 8kHz μ-law: 160 bytes per 20ms
         chunk_bytes = self._chunk_size
+        view = memoryview(audio)
         
-        for i in range(0, len(audio), chunk_bytes):
-            chunk = audio[i:i + chunk_bytes]
-            await self._queue.put(chunk)
+        self._chunks.extend(
+            view[i:i + chunk_bytes] for i in range(0, len(view), chunk_bytes)
+        )
+        self._not_empty.set()
         
         self._is_playing = True
         logger.debug(f"Queued {len(audio)} bytes as {len(audio) // chunk_bytes} chunks")
     
-    async def dequeue(self, timeout: float = 0.02) -> Optional[bytes]:
+    async def dequeue(self, timeout: float = 0.02) -> Optional[memoryview]:
         """
         Get the next audio chunk for playback.
         
@@ -126,35 +235,35 @@ class PlaybackQueue:
         Returns:
             Audio chunk or None if queue is empty/timeout
         """
-        try:
-            chunk = await asyncio.wait_for(
-                self._queue.get(),
-                timeout=timeout,
-            )
-            
-            if self._queue.empty():
-                self._is_playing = False
-            
-            return chunk
+        if not self._chunks:
+            try:
+                await asyncio.wait_for(self._not_empty.wait(), timeout=timeout)
+            except asyncio.TimeoutError:
+                return None
             
-        except asyncio.TimeoutError:
-            return None
+            # Cleared while waiting
+            if not self._chunks:
+                return None
+        
+        chunk = self._chunks.popleft()
+        
+        if not self._chunks:
+            self._not_empty.clear()
+            self._is_playing = False
+        
+        return chunk
     
     def is_playing(self) -> bool:
         """Check if there's audio being played."""
-        return self._is_playing and not self._queue.empty()
+        return self._is_playing and bool(self._chunks)
     
     def clear(self) -> None:
         """Clear all pending audio."""
-        while not self._queue.empty():
-            try:
-                self._queue.get_nowait()
-            except asyncio.QueueEmpty:
-                break
-        
+        self._chunks.clear()
+        self._not_empty.clear()
         self._is_playing = False
     
     @property
     def pending_chunks(self) -> int:
         """Get count of pending chunks."""
-        return self._queue.qsize()
+        return len(self._chunks)
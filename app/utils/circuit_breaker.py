@@ -61,9 +61,11 @@ class CircuitBreaker:
         self,
         name: str,
         config: CircuitBreakerConfig | None = None,
+        time_func: Callable[[], float] = time.monotonic,
     ) -> None:
         self.name = name
         self.config = config or CircuitBreakerConfig()
+        self._time = time_func
         
         self._state = CircuitState.CLOSED
         self._failure_count = 0
@@ -71,24 +73,30 @@ class CircuitBreaker:
         self._last_failure_time: float = 0
         self._half_open_calls = 0
         
+        # Message raised with CircuitBreakerOpen, resolved once
+        self._fallback_message = self.get_fallback_message(name)
+        
         logger.info(f"CircuitBreaker '{name}' initialized (threshold={self.config.failure_threshold})")
     
     @property
     def state(self) -> CircuitState:
         """Get current circuit state, checking for recovery."""
-        if self._state == CircuitState.OPEN:
-            # Check if recovery timeout has passed
-            if time.time() - self._last_failure_time >= self.config.recovery_timeout:
-                logger.info(f"CircuitBreaker '{self.name}' transitioning to HALF_OPEN")
-                self._state = CircuitState.HALF_OPEN
-                self._half_open_calls = 0
+        # Only an open circuit needs the clock; closed/half-open return directly
+        if self._state is not CircuitState.OPEN:
+            return self._state
+        
+        # Check if recovery timeout has passed
+        if self._time() - self._last_failure_time >= self.config.recovery_timeout:
+            logger.info(f"CircuitBreaker '{self.name}' transitioning to HALF_OPEN")
+            self._state = CircuitState.HALF_OPEN
+            self._half_open_calls = 0
         
         return self._state
     
     @property
     def is_available(self) -> bool:
         """Check if the circuit breaker allows requests."""
-        return self.state != CircuitState.OPEN
+        return self.state is not CircuitState.OPEN
     
     def get_fallback_message(self, service_type: str = "default") -> str:
         """Get Arabic fallback message for the service."""
@@ -106,14 +114,14 @@ class CircuitBreaker:
                 self._state = CircuitState.CLOSED
                 self._failure_count = 0
                 self._success_count = 0
-        elif self._state == CircuitState.CLOSED:
+        elif self._state == CircuitState.CLOSED and self._failure_count:
             # Reset failure count on success
             self._failure_count = 0
     
     def record_failure(self, error: Exception | None = None) -> None:
         """Record a failed call."""
         self._failure_count += 1
-        self._last_failure_time = time.time()
+        self._last_failure_time = self._time()
         
         logger.warning(
             f"CircuitBreaker '{self.name}' recorded failure #{self._failure_count}: {error}"
@@ -135,18 +143,18 @@ class CircuitBreaker:
         **kwargs: Any,
     ) -> Any:
         """Execute a function through the circuit breaker."""
-        if self.state == CircuitState.OPEN:
+        if self.state is CircuitState.OPEN:
             raise CircuitBreakerOpen(
                 self.name,
-                self.get_fallback_message(self.name),
+                self._fallback_message,
             )
         
-        if self._state == CircuitState.HALF_OPEN:
+        if self._state is CircuitState.HALF_OPEN:
             self._half_open_calls += 1
             if self._half_open_calls > self.config.half_open_max_calls:
                 raise CircuitBreakerOpen(
                     self.name,
-                    self.get_fallback_message(self.name),
+                    self._fallback_message,
                 )
         
         try:
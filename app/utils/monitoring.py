@@ -3,14 +3,22 @@ Monitoring and metrics collection for Nexus Miracle.
 Provides structured logging, timing decorators, and metrics.
 """
 
+import asyncio
+import atexit
+import copy
 import functools
 import logging
+import math
+import queue
 import time
+from array import array
 from contextlib import contextmanager
 from dataclasses import dataclass, field
 from datetime import datetime
+from logging.handlers import QueueHandler, QueueListener
 from typing import Any, Callable, TypeVar
-import json
+
+import orjson
 
 logger = logging.getLogger(__name__)
 
@@ -26,6 +34,76 @@ class MetricPoint:
     labels: dict[str, str] = field(default_factory=dict)
 
 
+class LatencyHistogram:
+    """
+    Log-linear latency histogram (HDR-style).
+    
+    Buckets grow by GROWTH (5% relative error) from MIN_MS; recording is
+    O(1) without allocation and percentiles walk the fixed bucket array,
+    so stats cost is independent of the number of samples.
+    """
+    
+    MIN_MS = 0.01
+    GROWTH = 1.05
+    BUCKETS = 320  # MIN_MS * GROWTH**320 ~ 60s; slower samples share the last bucket
+    
+    _LOG_MIN = math.log(MIN_MS)
+    _LOG_GROWTH = math.log(GROWTH)
+    
+    def __init__(self) -> None:
+        self.buckets = array("Q", bytes(8 * self.BUCKETS))
+        self.count = 0
+        self.total = 0.0
+        self.min = math.inf
+        self.max = 0.0
+    
+    def record(self, latency_ms: float) -> None:
+        """Add one latency sample."""
+        if latency_ms > self.MIN_MS:
+            idx = min(
+                int((math.log(latency_ms) - self._LOG_MIN) / self._LOG_GROWTH),
+                self.BUCKETS - 1,
+            )
+        else:
+            idx = 0
+        self.buckets[idx] += 1
+        self.count += 1
+        self.total += latency_ms
+        if latency_ms < self.min:
+            self.min = latency_ms
+        if latency_ms > self.max:
+            self.max = latency_ms
+    
+    def percentiles(self, *quantiles: float) -> list[float]:
+        """Get the given quantiles (ascending, 0-1) in one pass over the buckets."""
+        results: list[float] = []
+        targets = iter(quantiles)
+        target = next(targets, None)
+        cumulative = 0
+        
+        for idx, bucket_count in enumerate(self.buckets):
+            if not bucket_count:
+                continue
+            cumulative += bucket_count
+            while target is not None and cumulative >= self.count * target:
+                # Geometric midpoint of the bucket, clamped to observed range
+                value = self.MIN_MS * self.GROWTH ** (idx + 0.5)
+                results.append(min(max(value, self.min), self.max))
+                target = next(targets, None)
+            if target is None:
+                break
+        
+        return results
+    
+    def reset(self) -> None:
+        """Drop all samples."""
+        self.buckets = array("Q", bytes(8 * self.BUCKETS))
+        self.count = 0
+        self.total = 0.0
+        self.min = math.inf
+        self.max = 0.0
+
+
 class Metrics:
     """
     Metrics collection for the application.
@@ -34,20 +112,15 @@ class Metrics:
     - Latency histograms (VAD, ASR, LLM, TTS)
     - Counters (calls, errors)
     - Gauges (active calls)
-    """
     
-    _instance: "Metrics | None" = None
+    Use the module-level ``metrics`` instance; constructing Metrics()
+    creates a separate, empty collector.
+    """
     
-    def __new__(cls) -> "Metrics":
-        if cls._instance is None:
-            cls._instance = super().__new__(cls)
-            cls._instance._initialized = False
-        return cls._instance
+    # Scrapes within this window share one computed snapshot
+    STATS_TTL_S = 1.0
     
     def __init__(self) -> None:
-        if self._initialized:
-            return
-        
         # Counters
         self._call_count = 0
         self._error_count = 0
@@ -56,19 +129,23 @@ class Metrics:
         # Gauges
         self._active_calls = 0
         
-        # Histograms (store recent values)
-        self._latencies: dict[str, list[float]] = {
-            "vad": [],
-            "asr": [],
-            "llm_ttft": [],
-            "llm_total": [],
-            "tts_ttfb": [],
-            "tts_total": [],
-            "end_to_end": [],
+        # Histograms
+        self._latencies: dict[str, LatencyHistogram] = {
+            service: LatencyHistogram()
+            for service in (
+                "vad",
+                "asr",
+                "llm_ttft",
+                "llm_total",
+                "tts_ttfb",
+                "tts_total",
+                "end_to_end",
+            )
         }
-        self._max_samples = 100
         
-        self._initialized = True
+        # (monotonic time, snapshot) of the last get_all_stats
+        self._stats_cache: tuple[float, dict[str, Any]] | None = None
+        
         logger.info("Metrics collector initialized")
     
     # Counters
@@ -95,36 +172,42 @@ class Metrics:
     # Histograms
     def record_latency(self, service: str, latency_ms: float) -> None:
         """Record a latency measurement."""
-        if service in self._latencies:
-            self._latencies[service].append(latency_ms)
-            # Keep only recent samples
-            if len(self._latencies[service]) > self._max_samples:
-                self._latencies[service].pop(0)
+        histogram = self._latencies.get(service)
+        if histogram is not None:
+            histogram.record(latency_ms)
             
             logger.debug(f"Latency recorded: {service}={latency_ms:.2f}ms")
     
     def get_latency_stats(self, service: str) -> dict[str, float]:
         """Get latency statistics for a service."""
-        values = self._latencies.get(service, [])
-        if not values:
+        histogram = self._latencies.get(service)
+        if histogram is None or not histogram.count:
             return {"count": 0, "avg": 0, "p50": 0, "p95": 0, "p99": 0}
         
-        sorted_values = sorted(values)
-        count = len(values)
+        p50, p95, p99 = histogram.percentiles(0.5, 0.95, 0.99)
         
         return {
-            "count": count,
-            "avg": sum(values) / count,
-            "min": min(values),
-            "max": max(values),
-            "p50": sorted_values[int(count * 0.5)],
-            "p95": sorted_values[int(count * 0.95)] if count >= 20 else sorted_values[-1],
-            "p99": sorted_values[int(count * 0.99)] if count >= 100 else sorted_values[-1],
+            "count": histogram.count,
+            "avg": histogram.total / histogram.count,
+            "min": histogram.min,
+            "max": histogram.max,
+            "p50": p50,
+            "p95": p95,
+            "p99": p99,
         }
     
     def get_all_stats(self) -> dict[str, Any]:
-        """Get all metrics statistics."""
-        return {
+        """
+        Get all metrics statistics (computed at most once per STATS_TTL_S).
+        
+        Each caller gets its own copy, so mutating the result cannot
+        corrupt the cached snapshot.
+        """
+        now = time.monotonic()
+        if self._stats_cache is not None and now - self._stats_cache[0] < self.STATS_TTL_S:
+            return copy.deepcopy(self._stats_cache[1])
+        
+        stats = {
             "counters": {
                 "call_count": self._call_count,
                 "error_count": self._error_count,
@@ -139,6 +222,8 @@ class Metrics:
             },
             "timestamp": datetime.now().isoformat(),
         }
+        self._stats_cache = (now, stats)
+        return copy.deepcopy(stats)
     
     def reset(self) -> None:
         """Reset all metrics."""
@@ -146,11 +231,12 @@ class Metrics:
         self._error_count = 0
         self._appointment_count = 0
         self._active_calls = 0
-        for key in self._latencies:
-            self._latencies[key] = []
+        for histogram in self._latencies.values():
+            histogram.reset()
+        self._stats_cache = None
 
 
-# Global metrics instance
+# Global metrics instance, created once at import
 metrics = Metrics()
 
 
@@ -163,28 +249,29 @@ def timed(service: str) -> Callable[[Callable[..., T]], Callable[..., T]]:
         async def generate_response(prompt: str) -> str:
             ...
     """
+    # Bound once so each wrapped call uses closure locals, not global lookups
+    perf_counter = time.perf_counter
+    record_latency = metrics.record_latency
+    
     def decorator(func: Callable[..., T]) -> Callable[..., T]:
         @functools.wraps(func)
         async def async_wrapper(*args: Any, **kwargs: Any) -> T:
-            start_time = time.perf_counter()
+            start_time = perf_counter()
             try:
                 result = await func(*args, **kwargs)
                 return result
             finally:
-                elapsed_ms = (time.perf_counter() - start_time) * 1000
-                metrics.record_latency(service, elapsed_ms)
+                record_latency(service, (perf_counter() - start_time) * 1000)
         
         @functools.wraps(func)
         def sync_wrapper(*args: Any, **kwargs: Any) -> T:
-            start_time = time.perf_counter()
+            start_time = perf_counter()
             try:
                 result = func(*args, **kwargs)
                 return result
             finally:
-                elapsed_ms = (time.perf_counter() - start_time) * 1000
-                metrics.record_latency(service, elapsed_ms)
+                record_latency(service, (perf_counter() - start_time) * 1000)
         
-        import asyncio
         if asyncio.iscoroutinefunction(func):
             return async_wrapper
         return sync_wrapper
@@ -201,18 +288,63 @@ def measure_latency(service: str):
         with measure_latency("llm"):
             result = await call_llm()
     """
-    start_time = time.perf_counter()
+    perf_counter = time.perf_counter
+    start_time = perf_counter()
     try:
         yield
     finally:
-        elapsed_ms = (time.perf_counter() - start_time) * 1000
-        metrics.record_latency(service, elapsed_ms)
+        metrics.record_latency(service, (perf_counter() - start_time) * 1000)
+
+
+class _RootForwarder(logging.Handler):
+    """Pass queued records to the root logger's handlers (listener thread)."""
+    
+    def emit(self, record: logging.LogRecord) -> None:
+        handlers = logging.getLogger().handlers or [logging.lastResort]
+        for handler in handlers:
+            if handler is not None and record.levelno >= handler.level:
+                handler.handle(record)
+
+
+# Structured log records are written by a background thread, off the event loop
+_log_queue: queue.SimpleQueue[logging.LogRecord] = queue.SimpleQueue()
+_queue_handler = QueueHandler(_log_queue)
+_log_listener: QueueListener | None = None
+
+
+def _get_queue_handler() -> QueueHandler:
+    """Get the shared queue handler, starting its listener on first use."""
+    global _log_listener
+    
+    if _log_listener is None:
+        _log_listener = QueueListener(_log_queue, _RootForwarder())
+        _log_listener.start()
+        atexit.register(_log_listener.stop)
+    
+    return _queue_handler
+
+
+# Local time down to the second, reformatted only when the second changes
+_timestamp_cache: list[Any] = [-1, ""]
+
+
+def _timestamp() -> str:
+    """ISO-8601 local timestamp with millisecond precision."""
+    now = time.time()
+    second = int(now)
+    if second != _timestamp_cache[0]:
+        _timestamp_cache[0] = second
+        _timestamp_cache[1] = time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(second))
+    return f"{_timestamp_cache[1]}.{int((now - second) * 1000):03d}"
 
 
 class StructuredLogger:
     """
     Structured JSON logging for production.
     
+    Entries are queued and written to the root logger's handlers by a
+    background thread, so callers never block on handler I/O.
+    
     Usage:
         log = StructuredLogger("call_handler")
         log.info("Call started", call_id="abc123", patient="عمر")
@@ -221,29 +353,40 @@ class StructuredLogger:
     def __init__(self, service: str) -> None:
         self.service = service
         self.logger = logging.getLogger(service)
+        
+        handler = _get_queue_handler()
+        if handler not in self.logger.handlers:
+            self.logger.addHandler(handler)
+        self.logger.propagate = False
     
     def _format(self, level: str, message: str, **kwargs: Any) -> str:
         """Format log entry as JSON."""
         entry = {
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": _timestamp(),
             "level": level,
             "service": self.service,
             "message": message,
             **kwargs,
         }
-        return json.dumps(entry, ensure_ascii=False)
+        # orjson emits UTF-8 (Arabic stays readable) and datetimes as ISO-8601
+        return orjson.dumps(entry, default=str).decode()
+    
+    def _log(self, level: int, message: str, **kwargs: Any) -> None:
+        """Format and emit an entry, skipping formatting for disabled levels."""
+        if self.logger.isEnabledFor(level):
+            self.logger.log(level, self._format(logging.getLevelName(level), message, **kwargs))
     
     def debug(self, message: str, **kwargs: Any) -> None:
-        self.logger.debug(self._format("DEBUG", message, **kwargs))
+        self._log(logging.DEBUG, message, **kwargs)
     
     def info(self, message: str, **kwargs: Any) -> None:
-        self.logger.info(self._format("INFO", message, **kwargs))
+        self._log(logging.INFO, message, **kwargs)
     
     def warning(self, message: str, **kwargs: Any) -> None:
-        self.logger.warning(self._format("WARNING", message, **kwargs))
+        self._log(logging.WARNING, message, **kwargs)
     
     def error(self, message: str, **kwargs: Any) -> None:
-        self.logger.error(self._format("ERROR", message, **kwargs))
+        self._log(logging.ERROR, message, **kwargs)
     
     def critical(self, message: str, **kwargs: Any) -> None:
-        self.logger.critical(self._format("CRITICAL", message, **kwargs))
+        self._log(logging.CRITICAL, message, **kwargs)
@@ -4,21 +4,31 @@ Tests: Concurrent API requests, response times, memory usage.
 """
 
 import asyncio
+import atexit
 import aiohttp
 import time
-import statistics
 import psutil
 import os
-from dataclasses import dataclass
-from typing import Any
+import sys
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.utils.monitoring import LatencyHistogram
 
 # Configuration
 BASE_URL = os.getenv("API_URL", "http://localhost:8000")
 CONCURRENT_REQUESTS = 100
 DURATION_SECONDS = 10
+CONNECTION_LIMIT = 200
+PAGE_SIZE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+STATM_PATH = "/proc/self/statm"
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class LoadTestResult:
     """Results from a load test run."""
     total_requests: int
@@ -32,14 +42,41 @@ class LoadTestResult:
     error_rate: float
     memory_start_mb: float
     memory_end_mb: float
+    p99_per_second_ms: list[float] = field(default_factory=list)
 
 
-async def make_request(session: aiohttp.ClientSession, endpoint: str) -> tuple[bool, float]:
+def rss_sampler() -> Callable[[], float]:
+    """
+    Return a function giving this process's current RSS in MB.
+    
+    On Linux /proc/self/statm is kept open (closed at exit) and re-read
+    with pread, which is cheaper than psutil building a full memory_info()
+    per sample.
+    """
+    if os.path.exists(STATM_PATH):
+        fd = os.open(STATM_PATH, os.O_RDONLY)
+        atexit.register(os.close, fd)
+        
+        def sample() -> float:
+            return int(os.pread(fd, 256, 0).split()[1]) * PAGE_SIZE / 1024 / 1024
+        
+        return sample
+    
+    process = psutil.Process()
+    return lambda: process.memory_info().rss / 1024 / 1024
+
+
+async def make_request(
+    session: aiohttp.ClientSession,
+    endpoint: str,
+    method: str = "GET",
+) -> tuple[bool, float]:
     """Make a single request and return success status and latency."""
     start = time.perf_counter()
     try:
-        async with session.get(f"{BASE_URL}{endpoint}") as response:
-            await response.text()
+        async with session.request(method, f"{BASE_URL}{endpoint}") as response:
+            if method == "GET":
+                await response.read()  # drain without decoding
             latency_ms = (time.perf_counter() - start) * 1000
             return response.status == 200, latency_ms
     except Exception as e:
@@ -47,69 +84,87 @@ async def make_request(session: aiohttp.ClientSession, endpoint: str) -> tuple[b
         return False, latency_ms
 
 
+def create_session() -> aiohttp.ClientSession:
+    """Create the HTTP session shared by every scenario, so pooled connections stay warm."""
+    connector = aiohttp.TCPConnector(
+        limit=CONNECTION_LIMIT,
+        keepalive_timeout=30,
+        ttl_dns_cache=300,
+    )
+    return aiohttp.ClientSession(connector=connector)
+
+
 async def run_load_test(
+    session: aiohttp.ClientSession,
     endpoint: str,
     requests_per_second: int = 100,
     duration_seconds: int = 10,
+    method: str = "GET",
 ) -> LoadTestResult:
     """Run load test against an endpoint."""
     print(f"\n🔥 Load Testing: {endpoint}")
     print(f"   Target: {requests_per_second} req/s for {duration_seconds}s")
     
     # Record starting memory
-    process = psutil.Process()
-    memory_start = process.memory_info().rss / 1024 / 1024
+    rss_mb = rss_sampler()
+    memory_start = rss_mb()
     
     successes = 0
     failures = 0
-    latencies: list[float] = []
+    histogram = LatencyHistogram()
+    # One histogram per second of the run, for a p99 time series
+    per_second = [LatencyHistogram() for _ in range(duration_seconds)]
     
-    connector = aiohttp.TCPConnector(limit=100)
-    async with aiohttp.ClientSession(connector=connector) as session:
-        start_time = time.perf_counter()
-        end_time = start_time + duration_seconds
-        
-        while time.perf_counter() < end_time:
-            # Launch batch of concurrent requests
-            tasks = [
-                make_request(session, endpoint)
-                for _ in range(requests_per_second)
-            ]
-            results = await asyncio.gather(*tasks, return_exceptions=True)
-            
-            for result in results:
-                if isinstance(result, Exception):
-                    failures += 1
-                else:
-                    success, latency = result
-                    latencies.append(latency)
-                    if success:
-                        successes += 1
-                    else:
-                        failures += 1
-            
-            # Wait for next second
-            await asyncio.sleep(max(0, 1 - (time.perf_counter() % 1)))
+    # Caps in-flight requests if the server falls behind the arrival rate
+    semaphore = asyncio.Semaphore(CONCURRENT_REQUESTS)
+    
+    async def timed_request(second: int) -> None:
+        nonlocal successes, failures
+        async with semaphore:
+            success, latency = await make_request(session, endpoint, method)
+        histogram.record(latency)
+        per_second[second].record(latency)
+        if success:
+            successes += 1
+        else:
+            failures += 1
+    
+    loop = asyncio.get_running_loop()
+    start_time = loop.time()
+    interval = 1 / requests_per_second
+    tasks: list[asyncio.Task[None]] = []
+    
+    # Issue requests at a steady rate rather than one burst per second
+    for i in range(requests_per_second * duration_seconds):
+        delay = start_time + i * interval - loop.time()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        tasks.append(asyncio.create_task(timed_request(i // requests_per_second)))
+    
+    await asyncio.gather(*tasks)
     
     # Record ending memory
-    memory_end = process.memory_info().rss / 1024 / 1024
+    memory_end = rss_mb()
     
     # Calculate statistics
     total = successes + failures
-    sorted_latencies = sorted(latencies) if latencies else [0]
+    p50, p95, p99 = histogram.percentiles(0.5, 0.95, 0.99) if histogram.count else (0, 0, 0)
     
     result = LoadTestResult(
         total_requests=total,
         successful_requests=successes,
         failed_requests=failures,
-        avg_latency_ms=statistics.mean(latencies) if latencies else 0,
-        p50_latency_ms=sorted_latencies[int(len(sorted_latencies) * 0.5)],
-        p95_latency_ms=sorted_latencies[int(len(sorted_latencies) * 0.95)],
-        p99_latency_ms=sorted_latencies[int(len(sorted_latencies) * 0.99)],
+        avg_latency_ms=histogram.total / histogram.count if histogram.count else 0,
+        p50_latency_ms=p50,
+        p95_latency_ms=p95,
+        p99_latency_ms=p99,
         requests_per_second=total / duration_seconds,
         error_rate=(failures / total * 100) if total > 0 else 0,
         memory_start_mb=memory_start,
         memory_end_mb=memory_end,
+        p99_per_second_ms=[
+            h.percentiles(0.99)[0] if h.count else 0 for h in per_second
+        ],
     )
     
     return result
@@ -126,6 +181,9 @@ def print_results(result: LoadTestResult, test_name: str) -> bool:
     print(f"   P50 Latency: {result.p50_latency_ms:.2f}ms")
     print(f"   P95 Latency: {result.p95_latency_ms:.2f}ms")
     print(f"   P99 Latency: {result.p99_latency_ms:.2f}ms")
+    if result.p99_per_second_ms:
+        series = ", ".join(f"{p99:.0f}" for p99 in result.p99_per_second_ms)
+        print(f"   P99 per second: [{series}]ms")
     print(f"   RPS: {result.requests_per_second:.1f}")
     print(f"   Memory: {result.memory_start_mb:.1f}MB → {result.memory_end_mb:.1f}MB")
     
@@ -151,19 +209,22 @@ def print_results(result: LoadTestResult, test_name: str) -> bool:
     return passed
 
 
-async def test_health_endpoint():
+async def test_health_endpoint(session: aiohttp.ClientSession):
     """T8.11: Test /api/health endpoint at 100 req/s."""
     result = await run_load_test(
+        session,
         endpoint="/api/health",
         requests_per_second=100,
         duration_seconds=10,
+        method="HEAD",  # status only; keeps payload cost out of the measurement
     )
     return print_results(result, "T8.11: API Load - 100 req/s")
 
 
-async def test_settings_endpoint():
+async def test_settings_endpoint(session: aiohttp.ClientSession):
     """Test /api/settings endpoint."""
     result = await run_load_test(
+        session,
         endpoint="/api/settings",
         requests_per_second=50,
         duration_seconds=5,
@@ -171,9 +232,10 @@ async def test_settings_endpoint():
     return print_results(result, "Settings API Load")
 
 
-async def test_doctors_endpoint():
+async def test_doctors_endpoint(session: aiohttp.ClientSession):
     """Test /api/doctors endpoint."""
     result = await run_load_test(
+        session,
         endpoint="/api/doctors",
         requests_per_second=50,
         duration_seconds=5,
@@ -181,27 +243,25 @@ async def test_doctors_endpoint():
     return print_results(result, "Doctors API Load")
 
 
-async def test_memory_stability():
+async def test_memory_stability(session: aiohttp.ClientSession):
     """T8.12: Test memory stability under load."""
     print("\n🧠 Testing Memory Stability...")
     
-    process = psutil.Process()
+    rss_mb = rss_sampler()
     memory_samples: list[float] = []
     
     # Sample memory over time while making requests
-    connector = aiohttp.TCPConnector(limit=50)
-    async with aiohttp.ClientSession(connector=connector) as session:
-        for i in range(10):
-            # Make batch of requests
-            tasks = [make_request(session, "/health") for _ in range(50)]
-            await asyncio.gather(*tasks)
-            
-            # Sample memory
-            memory_mb = process.memory_info().rss / 1024 / 1024
-            memory_samples.append(memory_mb)
-            print(f"   Sample {i+1}: {memory_mb:.1f}MB")
-            
-            await asyncio.sleep(1)
+    for i in range(10):
+        # Make batch of requests
+        tasks = [make_request(session, "/health") for _ in range(50)]
+        await asyncio.gather(*tasks)
+        
+        # Sample memory
+        memory_mb = rss_mb()
+        memory_samples.append(memory_mb)
+        print(f"   Sample {i+1}: {memory_mb:.1f}MB")
+        
+        await asyncio.sleep(1)
     
     # Check for memory leak
     memory_growth = memory_samples[-1] - memory_samples[0]
@@ -227,19 +287,20 @@ async def main():
     
     results = []
     
-    # T8.11: API Load Test
-    try:
-        results.append(("T8.11: API Load", await test_health_endpoint()))
-    except Exception as e:
-        print(f"❌ T8.11 Failed: {e}")
-        results.append(("T8.11: API Load", False))
-    
-    # T8.12: Memory Test
-    try:
-        results.append(("T8.12: Memory", await test_memory_stability()))
-    except Exception as e:
-        print(f"❌ T8.12 Failed: {e}")
-        results.append(("T8.12: Memory", False))
+    async with create_session() as session:
+        # T8.11: API Load Test
+        try:
+            results.append(("T8.11: API Load", await test_health_endpoint(session)))
+        except Exception as e:
+            print(f"❌ T8.11 Failed: {e}")
+            results.append(("T8.11: API Load", False))
+        
+        # T8.12: Memory Test
+        try:
+            results.append(("T8.12: Memory", await test_memory_stability(session)))
+        except Exception as e:
+            print(f"❌ T8.12 Failed: {e}")
+            results.append(("T8.12: Memory", False))
     
     # Summary
     print("\n" + "=" * 60)
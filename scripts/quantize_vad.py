@@ -0,0 +1,87 @@
+"""
+Nexus Miracle - Silero VAD INT8 Quantization
+
+Writes a dynamically INT8-quantized copy of the Silero VAD ONNX model to
+data/silero_vad_int8.onnx, which VADService loads in preference to the
+float model. Requires the `onnx` package (quantization only).
+
+Usage:
+    python scripts/quantize_vad.py [reference.wav]
+
+If a 16kHz mono 16-bit WAV is given, both models are run over it and the
+speech probability shift is reported, to decide whether VAD_THRESHOLD_INT8
+needs setting.
+"""
+
+import sys
+import wave
+from pathlib import Path
+
+import numpy as np
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from loguru import logger
+from onnxruntime.quantization import QuantType, quantize_dynamic
+
+from app.services.vad_service import VADService
+
+# Probability shift above which a separate INT8 threshold is recommended
+MAX_MEAN_SHIFT = 0.02
+
+
+def speech_probabilities(model_path: Path, audio: np.ndarray) -> np.ndarray:
+    """Run a model over int16 audio, one probability per 512-sample window."""
+    vad = VADService()
+    vad._session = vad._load_session(model_path)
+    return np.array([
+        vad._run_model(audio[i:i + vad.WINDOW_SAMPLES])
+        for i in range(0, len(audio) - vad.WINDOW_SAMPLES + 1, vad.WINDOW_SAMPLES)
+    ])
+
+
+def main() -> None:
+    """Quantize the model and optionally compare it against the original."""
+    vad = VADService()
+    target = VADService.INT8_MODEL_PATH
+    
+    configured = vad._settings.vad_model_path
+    source = Path(configured) if configured else VADService._package_model_path()
+    
+    if source is None or not source.is_file():
+        logger.error("Silero VAD model not found (install silero-vad or set VAD_MODEL_PATH)")
+        sys.exit(1)
+    
+    target.parent.mkdir(parents=True, exist_ok=True)
+    quantize_dynamic(str(source), str(target), weight_type=QuantType.QInt8)
+    logger.info(f"Quantized {source} -> {target}")
+    
+    if len(sys.argv) < 2:
+        return
+    
+    with wave.open(sys.argv[1], "rb") as wav:
+        if wav.getframerate() != 16000 or wav.getnchannels() != 1 or wav.getsampwidth() != 2:
+            logger.error("Reference audio must be 16kHz mono 16-bit WAV")
+            sys.exit(1)
+        audio = np.frombuffer(wav.readframes(wav.getnframes()), dtype=np.int16)
+    
+    fp32 = speech_probabilities(source, audio)
+    int8 = speech_probabilities(target, audio)
+    shift = float(np.mean(int8) - np.mean(fp32))
+    threshold = vad._threshold
+    flips = int(np.sum((fp32 >= threshold) != (int8 >= threshold)))
+    
+    logger.info(f"Mean probability: fp32={np.mean(fp32):.3f}, int8={np.mean(int8):.3f}")
+    logger.info(f"Max difference: {np.max(np.abs(int8 - fp32)):.3f}")
+    logger.info(f"Windows changing decision at threshold {threshold}: {flips}/{len(fp32)}")
+    
+    if abs(shift) > MAX_MEAN_SHIFT:
+        logger.warning(
+            f"Mean shift {shift:+.3f} exceeds {MAX_MEAN_SHIFT}; "
+            f"consider VAD_THRESHOLD_INT8={threshold + shift:.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
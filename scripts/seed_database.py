@@ -6,26 +6,38 @@ Populates the database with sample data for:
 - 5 Insurance companies
 - Time slots for next 30 days
 - 3 Sample patients with appointments
+
+Usage:
+    python scripts/seed_database.py [--reset-schema]
+
+Existing tables are emptied and reused; pass --reset-schema to drop and
+recreate them (needed after model column changes).
 """
 
 import asyncio
 import sys
+from collections.abc import Iterable, Iterator
 from datetime import date, datetime, time, timedelta
+from itertools import islice
 from pathlib import Path
+from typing import Any
 
 # Add parent directory to path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from loguru import logger
+from sqlalchemy import delete, insert
 
 from app.models.database import (
     Appointment,
     Base,
     Doctor,
     Insurance,
+    InsuranceAlias,
     Patient,
     TimeSlot,
 )
+from app.crud.insurance import build_alias_rows
 from app.services.db_service import close_db, get_engine, init_db
 
 
@@ -182,47 +194,54 @@ PATIENTS = [
 # Time Slot Generation
 # ===========================================
 
-def generate_time_slots_for_doctor(doctor_id: int) -> list[TimeSlot]:
-    """Generate weekly time slots for a doctor."""
-    slots = []
-    
-    # Sunday-Thursday: 8 AM - 10 PM
-    for day in range(5):  # 0=Sunday to 4=Thursday
-        slots.append(TimeSlot(
-            doctor_id=doctor_id,
-            day_of_week=day,
-            start_time=time(8, 0),
-            end_time=time(14, 0),
-            is_available=True,
-        ))
-        slots.append(TimeSlot(
-            doctor_id=doctor_id,
-            day_of_week=day,
-            start_time=time(16, 0),
-            end_time=time(22, 0),
-            is_available=True,
-        ))
-    
-    # Friday: 4 PM - 10 PM only
-    slots.append(TimeSlot(
-        doctor_id=doctor_id,
-        day_of_week=5,  # Friday
-        start_time=time(16, 0),
-        end_time=time(22, 0),
-        is_available=True,
-    ))
-    
-    # Saturday: Optional rest day (no slots)
-    
-    return slots
+# (day_of_week, start, end); Sunday-Thursday 8-14 and 16-22, Friday 16-22,
+# Saturday off
+WEEKLY_TEMPLATE: tuple[tuple[int, time, time], ...] = (
+    *(
+        (day, start, end)
+        for day in range(5)  # 0=Sunday to 4=Thursday
+        for start, end in ((time(8, 0), time(14, 0)), (time(16, 0), time(22, 0)))
+    ),
+    (5, time(16, 0), time(22, 0)),  # Friday
+)
+
+
+# Rows per executemany page when bulk-inserting time slots
+INSERT_BATCH_SIZE = 10_000
+
+
+def generate_time_slots_for_doctor(doctor_id: int) -> list[dict[str, Any]]:
+    """Generate weekly time slot rows for a doctor, for a bulk insert."""
+    return [
+        {
+            "doctor_id": doctor_id,
+            "day_of_week": day,
+            "start_time": start,
+            "end_time": end,
+            "is_available": True,
+        }
+        for day, start, end in WEEKLY_TEMPLATE
+    ]
+
+
+def batched(rows: Iterable[dict[str, Any]], size: int) -> Iterator[list[dict[str, Any]]]:
+    """Split rows into lists of at most size, without materializing them all."""
+    iterator = iter(rows)
+    while page := list(islice(iterator, size)):
+        yield page
 
 
 # ===========================================
 # Seed Functions
 # ===========================================
 
-async def seed_database():
-    """Seed the database with sample data."""
+async def seed_database(reset_schema: bool = False):
+    """
+    Seed the database with sample data.
+    
+    Args:
+        reset_schema: Drop and recreate all tables instead of emptying them
+    """
     from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
     
     logger.info("Starting database seeding...")
@@ -230,100 +249,120 @@ async def seed_database():
     # Initialize database
     await init_db()
     
-    # Create tables
+    # Create missing tables and clear existing data (children first);
+    # SQLite has no TRUNCATE, and DELETE avoids rebuilding tables and indexes
     engine = get_engine()
     async with engine.begin() as conn:
-        await conn.run_sync(Base.metadata.drop_all)
+        if reset_schema:
+            await conn.run_sync(Base.metadata.drop_all)
         await conn.run_sync(Base.metadata.create_all)
+        for table in reversed(Base.metadata.sorted_tables):
+            await conn.execute(delete(table))
     
-    logger.info("Tables created")
+    logger.info("Tables ready")
     
     # Create session
     async_session = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
     
-    async with async_session() as session:
+    # One transaction for the whole seed; committed when the block exits
+    async with async_session.begin() as session:
         # Seed doctors
         logger.info("Seeding doctors...")
-        doctors = []
-        for doctor_data in DOCTORS:
-            doctor = Doctor(**doctor_data)
-            session.add(doctor)
-            doctors.append(doctor)
-        await session.flush()
+        result = await session.execute(
+            insert(Doctor).returning(Doctor.id, sort_by_parameter_order=True),
+            DOCTORS,
+        )
+        doctor_ids = list(result.scalars())
         
-        for doctor in doctors:
-            await session.refresh(doctor)
-            logger.info(f"  Created doctor: {doctor.id} - {doctor.name_ar}")
+        for doctor_id, doctor_data in zip(doctor_ids, DOCTORS):
+            logger.info(f"  Created doctor: {doctor_id} - {doctor_data['name_ar']}")
         
         # Seed time slots for each doctor
         logger.info("Seeding time slots...")
-        for doctor in doctors:
-            slots = generate_time_slots_for_doctor(doctor.id)
-            for slot in slots:
-                session.add(slot)
-        await session.flush()
-        logger.info(f"  Created {len(doctors) * 11} time slots")
+        slot_rows = (
+            slot
+            for doctor_id in doctor_ids
+            for slot in generate_time_slots_for_doctor(doctor_id)
+        )
+        slot_count = 0
+        for page in batched(slot_rows, INSERT_BATCH_SIZE):
+            await session.execute(insert(TimeSlot), page)
+            slot_count += len(page)
+        logger.info(f"  Created {slot_count} time slots")
         
         # Seed insurance companies
         logger.info("Seeding insurance companies...")
-        for insurance_data in INSURANCE_COMPANIES:
-            insurance = Insurance(**insurance_data)
-            session.add(insurance)
-            logger.info(f"  Created insurance: {insurance.company_name_ar}")
-        await session.flush()
+        result = await session.execute(
+            insert(Insurance).returning(Insurance.id, sort_by_parameter_order=True),
+            INSURANCE_COMPANIES,
+        )
+        insurance_ids = list(result.scalars())
+        logger.info(f"  Created {len(insurance_ids)} insurance companies")
+        
+        # Normalized alias index for O(1) name matching
+        alias_rows = [
+            row
+            for insurance_id, insurance_data in zip(insurance_ids, INSURANCE_COMPANIES)
+            for row in build_alias_rows(
+                insurance_id,
+                [
+                    insurance_data["company_name"],
+                    insurance_data["company_name_ar"],
+                    *insurance_data["name_variations"],
+                ],
+            )
+        ]
+        await session.execute(insert(InsuranceAlias), alias_rows)
+        logger.info(f"  Created {len(alias_rows)} insurance aliases")
         
         # Seed patients
         logger.info("Seeding patients...")
-        patients = []
-        for patient_data in PATIENTS:
-            patient = Patient(**patient_data)
-            session.add(patient)
-            patients.append(patient)
-        await session.flush()
+        result = await session.execute(
+            insert(Patient).returning(Patient.id, sort_by_parameter_order=True),
+            PATIENTS,
+        )
+        patient_ids = list(result.scalars())
         
-        for patient in patients:
-            await session.refresh(patient)
-            logger.info(f"  Created patient: {patient.id} - {patient.name_ar}")
+        for patient_id, patient_data in zip(patient_ids, PATIENTS):
+            logger.info(f"  Created patient: {patient_id} - {patient_data['name_ar']}")
         
         # Seed sample appointments
         logger.info("Seeding sample appointments...")
         tomorrow = datetime.now().replace(hour=10, minute=0, second=0, microsecond=0) + timedelta(days=1)
         
-        # Appointment 1: Abdullah with Dr. Fahad (Orthopedics)
-        appt1 = Appointment(
-            patient_id=patients[0].id,
-            doctor_id=doctors[0].id,
-            datetime=tomorrow,
-            status="confirmed",
-            notes="Follow-up for knee pain",
-            duration_minutes=30,
-        )
-        session.add(appt1)
-        
-        # Appointment 2: Fatima with Dr. Noura (Internal Medicine)
-        appt2 = Appointment(
-            patient_id=patients[1].id,
-            doctor_id=doctors[2].id,
-            datetime=tomorrow + timedelta(hours=2),
-            status="pending",
-            notes="Annual checkup",
-            duration_minutes=30,
-        )
-        session.add(appt2)
-        
-        # Appointment 3: Youssef with Dr. Sarah (Pediatrics) - for his child
-        appt3 = Appointment(
-            patient_id=patients[2].id,
-            doctor_id=doctors[4].id,
-            datetime=tomorrow + timedelta(days=1),
-            status="pending",
-            notes="Child vaccination",
-            duration_minutes=30,
-        )
-        session.add(appt3)
-        
-        await session.commit()
-        logger.info("  Created 3 sample appointments")
+        appointment_rows = [
+            # Appointment 1: Abdullah with Dr. Fahad (Orthopedics)
+            {
+                "patient_id": patient_ids[0],
+                "doctor_id": doctor_ids[0],
+                "datetime": tomorrow,
+                "status": "confirmed",
+                "notes": "Follow-up for knee pain",
+                "duration_minutes": 30,
+            },
+            
+            # Appointment 2: Fatima with Dr. Noura (Internal Medicine)
+            {
+                "patient_id": patient_ids[1],
+                "doctor_id": doctor_ids[2],
+                "datetime": tomorrow + timedelta(hours=2),
+                "status": "pending",
+                "notes": "Annual checkup",
+                "duration_minutes": 30,
+            },
+            
+            # Appointment 3: Youssef with Dr. Sarah (Pediatrics) - for his child
+            {
+                "patient_id": patient_ids[2],
+                "doctor_id": doctor_ids[4],
+                "datetime": tomorrow + timedelta(days=1),
+                "status": "pending",
+                "notes": "Child vaccination",
+                "duration_minutes": 30,
+            },
+        ]
+        await session.execute(insert(Appointment), appointment_rows)
+        logger.info(f"  Created {len(appointment_rows)} sample appointments")
     
     await close_db()
     
@@ -336,7 +375,7 @@ async def seed_database():
     logger.info(f"  - {len(INSURANCE_COMPANIES)} insurance companies")
     logger.info(f"  - {len(PATIENTS)} patients")
     logger.info(f"  - 3 sample appointments")
-    logger.info(f"  - {len(DOCTORS) * 11} time slots")
+    logger.info(f"  - {len(DOCTORS) * len(WEEKLY_TEMPLATE)} time slots")
 
 
 if __name__ == "__main__":
@@ -349,4 +388,4 @@ if __name__ == "__main__":
         colorize=True,
     )
     
-    asyncio.run(seed_database())
+    asyncio.run(seed_database(reset_schema="--reset-schema" in sys.argv))
@@ -6,35 +6,52 @@ Run with: python scripts/test_telnyx.py
 
 import asyncio
 import base64
-import json
 import sys
 import time
-from datetime import datetime
+from datetime import datetime, timezone
 
 import httpx
+import orjson
 import websockets
 
 # Test configuration
 BASE_URL = "http://localhost:8000"
 WS_URL = "ws://localhost:8000"
+HTTP_LIMITS = httpx.Limits(max_connections=10, max_keepalive_connections=5)
 
-# Test results
-results = []
+# Media frames are tiny μ-law chunks: skip permessage-deflate and keepalives
+WS_OPTIONS = {
+    "ping_interval": None,
+    "compression": None,
+    "max_size": 2**16,
+}
+
+# Prebuilt WebSocket frames
+MOCK_MULAW = bytes([128]) * 160  # 20ms of μ-law silence at 8kHz
+CONNECTED_FRAME = orjson.dumps({"event": "connected"}).decode()
+START_FRAME = orjson.dumps({"event": "start"}).decode()
+# Telnyx's media stream protocol is JSON text frames with base64 payloads,
+# so the envelope stays; the server decodes it once and works on raw μ-law
+MEDIA_FRAME = orjson.dumps({
+    "event": "media",
+    "media": {
+        "payload": base64.b64encode(MOCK_MULAW).decode(),
+        "track": "inbound",
+    }
+}).decode()
+
+# Test results as (test_id, passed, details)
+results: list[tuple[str, bool, str]] = []
 
 
 def log_result(test_id: str, passed: bool, details: str = ""):
     """Log test result."""
     status = "✅ PASS" if passed else "❌ FAIL"
     print(f"{status} - {test_id}: {details}")
-    results.append({
-        "test": test_id,
-        "passed": passed,
-        "details": details,
-        "timestamp": datetime.now().isoformat(),
-    })
+    results.append((test_id, passed, details))
 
 
-async def test_t4_1_webhook_endpoint():
+async def test_t4_1_webhook_endpoint(client: httpx.AsyncClient):
     """T4.1: Webhook Endpoint - POST with mock payload."""
     print("\n" + "="*50)
     print("T4.1: Webhook Endpoint")
@@ -52,23 +69,21 @@ async def test_t4_1_webhook_endpoint():
     }
     
     try:
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                f"{BASE_URL}/api/telephony/webhook",
-                json=payload,
-                timeout=10.0,
-            )
-            
-            if response.status_code == 200:
-                log_result("T4.1", True, f"Response: {response.json()}")
-            else:
-                log_result("T4.1", False, f"Status: {response.status_code}")
-                
+        response = await client.post(
+            "/api/telephony/webhook",
+            json=payload,
+        )
+        
+        if response.status_code == 200:
+            log_result("T4.1", True, f"Response: {response.json()}")
+        else:
+            log_result("T4.1", False, f"Status: {response.status_code}")
+        
     except Exception as e:
         log_result("T4.1", False, f"Error: {e}")
 
 
-async def test_t4_2_call_initiated():
+async def test_t4_2_call_initiated(client: httpx.AsyncClient):
     """T4.2: Call Initiated Event - Server attempts to answer."""
     print("\n" + "="*50)
     print("T4.2: Call Initiated Event")
@@ -87,19 +102,17 @@ async def test_t4_2_call_initiated():
     }
     
     try:
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                f"{BASE_URL}/api/telephony/webhook",
-                json=payload,
-                timeout=10.0,
-            )
-            
-            # Should return 200 even if Telnyx API fails (mock call)
-            if response.status_code == 200:
-                log_result("T4.2", True, "Webhook processed (Telnyx API call expected to fail in test)")
-            else:
-                log_result("T4.2", False, f"Status: {response.status_code}")
-                
+        response = await client.post(
+            "/api/telephony/webhook",
+            json=payload,
+        )
+        
+        # Should return 200 even if Telnyx API fails (mock call)
+        if response.status_code == 200:
+            log_result("T4.2", True, "Webhook processed (Telnyx API call expected to fail in test)")
+        else:
+            log_result("T4.2", False, f"Status: {response.status_code}")
+        
     except Exception as e:
         log_result("T4.2", False, f"Error: {e}")
 
@@ -115,10 +128,10 @@ async def test_t4_3_websocket_connection():
     try:
         async with websockets.connect(
             f"{WS_URL}/api/telephony/media/{call_id}",
-            ping_interval=None,
+            **WS_OPTIONS,
         ) as ws:
             # Send start event
-            await ws.send(json.dumps({"event": "connected"}))
+            await ws.send(CONNECTED_FRAME)
             
             # Wait briefly
             await asyncio.sleep(1)
@@ -141,27 +154,17 @@ async def test_t4_4_audio_receive():
     
     call_id = "test-ws-004"
     
-    # Create mock μ-law audio (160 bytes = 20ms at 8kHz)
-    mock_audio = bytes([128] * 160)  # Silence in μ-law
-    audio_b64 = base64.b64encode(mock_audio).decode()
-    
     try:
         async with websockets.connect(
             f"{WS_URL}/api/telephony/media/{call_id}",
-            ping_interval=None,
+            **WS_OPTIONS,
         ) as ws:
             # Send start event
-            await ws.send(json.dumps({"event": "start"}))
+            await ws.send(START_FRAME)
             await asyncio.sleep(0.5)
             
             # Send audio chunk
-            await ws.send(json.dumps({
-                "event": "media",
-                "media": {
-                    "payload": audio_b64,
-                    "track": "inbound",
-                }
-            }))
+            await ws.send(MEDIA_FRAME)
             
             # Wait for processing
             await asyncio.sleep(1)
@@ -172,6 +175,16 @@ async def test_t4_4_audio_receive():
         log_result("T4.4", False, f"Error: {e}")
 
 
+async def _recv_until_media(ws) -> str:
+    """Read messages until a media event with a payload; return the payload."""
+    while True:
+        data = orjson.loads(await ws.recv())
+        if data.get("event") == "media":
+            payload = data.get("media", {}).get("payload", "")
+            if payload:
+                return payload
+
+
 async def test_t4_5_audio_send():
     """T4.5: Audio Send - Receive audio from server."""
     print("\n" + "="*50)
@@ -184,26 +197,20 @@ async def test_t4_5_audio_send():
     try:
         async with websockets.connect(
             f"{WS_URL}/api/telephony/media/{call_id}",
-            ping_interval=None,
+            **WS_OPTIONS,
         ) as ws:
             # Send start event to trigger greeting
-            await ws.send(json.dumps({"event": "start"}))
+            await ws.send(START_FRAME)
             
-            # Listen for responses (with timeout)
+            # Wait for the first media frame under a single deadline
             try:
-                for _ in range(20):  # Max 20 attempts
-                    msg = await asyncio.wait_for(ws.recv(), timeout=0.5)
-                    data = json.loads(msg)
-                    
-                    if data.get("event") == "media":
-                        payload = data.get("media", {}).get("payload", "")
-                        if payload:
-                            # Validate base64
-                            audio = base64.b64decode(payload)
-                            received_audio = True
-                            log_result("T4.5", True, f"Received {len(audio)} bytes audio")
-                            break
-                            
+                payload = await asyncio.wait_for(_recv_until_media(ws), timeout=5.0)
+                
+                # Validate base64
+                audio = base64.b64decode(payload)
+                received_audio = True
+                log_result("T4.5", True, f"Received {len(audio)} bytes audio")
+                
             except asyncio.TimeoutError:
                 pass
             
@@ -214,7 +221,7 @@ async def test_t4_5_audio_send():
         log_result("T4.5", False, f"Error: {e}")
 
 
-async def test_t4_6_call_hangup():
+async def test_t4_6_call_hangup(client: httpx.AsyncClient):
     """T4.6: Call Hangup Event - Session cleanup."""
     print("\n" + "="*50)
     print("T4.6: Call Hangup Event")
@@ -245,22 +252,20 @@ async def test_t4_6_call_hangup():
     }
     
     try:
-        async with httpx.AsyncClient() as client:
-            # Create session
-            await client.post(f"{BASE_URL}/api/telephony/webhook", json=init_payload)
-            
-            # Send hangup
-            response = await client.post(
-                f"{BASE_URL}/api/telephony/webhook",
-                json=hangup_payload,
-                timeout=10.0,
-            )
-            
-            if response.status_code == 200:
-                log_result("T4.6", True, "Hangup processed, session cleaned")
-            else:
-                log_result("T4.6", False, f"Status: {response.status_code}")
-                
+        # Create session
+        await client.post("/api/telephony/webhook", json=init_payload)
+        
+        # Send hangup
+        response = await client.post(
+            "/api/telephony/webhook",
+            json=hangup_payload,
+        )
+        
+        if response.status_code == 200:
+            log_result("T4.6", True, "Hangup processed, session cleaned")
+        else:
+            log_result("T4.6", False, f"Status: {response.status_code}")
+        
     except Exception as e:
         log_result("T4.6", False, f"Error: {e}")
 
@@ -275,12 +280,13 @@ async def test_t4_7_concurrent_calls():
         try:
             async with websockets.connect(
                 f"{WS_URL}/api/telephony/media/{call_id}",
-                ping_interval=None,
+                **WS_OPTIONS,
             ) as ws:
-                await ws.send(json.dumps({"event": "connected"}))
+                await ws.send(CONNECTED_FRAME)
                 await asyncio.sleep(2)
                 return ws.open
-        except:
+        except (OSError, websockets.exceptions.WebSocketException, asyncio.TimeoutError) as e:
+            print(f"   {call_id}: connect_call failed: {type(e).__name__}: {e}")
             return False
     
     try:
@@ -302,59 +308,82 @@ async def test_t4_7_concurrent_calls():
         log_result("T4.7", False, f"Error: {e}")
 
 
-async def test_t4_8_status_check():
+async def test_t4_8_status_check(client: httpx.AsyncClient):
     """T4.8: Status Check - Verify telephony status endpoint."""
     print("\n" + "="*50)
     print("T4.8: Telephony Status")
     print("="*50)
     
     try:
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                f"{BASE_URL}/api/telephony",
-                timeout=10.0,
-            )
-            
-            if response.status_code == 200:
-                data = response.json()
-                log_result("T4.8", True, f"Status: {data}")
-            else:
-                log_result("T4.8", False, f"Status: {response.status_code}")
-                
+        response = await client.get("/api/telephony")
+        
+        if response.status_code == 200:
+            data = response.json()
+            log_result("T4.8", True, f"Status: {data}")
+        else:
+            log_result("T4.8", False, f"Status: {response.status_code}")
+        
     except Exception as e:
         log_result("T4.8", False, f"Error: {e}")
 
 
+async def _warm_up_connection() -> None:
+    """Open and close one TCP connection so the first test skips the cold lookup."""
+    url = httpx.URL(BASE_URL)
+    try:
+        _, writer = await asyncio.wait_for(
+            asyncio.open_connection(url.host, url.port), timeout=2.0
+        )
+        writer.close()
+        await writer.wait_closed()
+    except (OSError, asyncio.TimeoutError):
+        pass
+
+
 async def main():
     """Run all tests."""
     print("\n" + "="*60)
     print("  PHASE 4: TELNYX INTEGRATION TESTS")
     print("="*60)
     print(f"Server: {BASE_URL}")
-    print(f"Started: {datetime.now().isoformat()}")
+    started = datetime.now(timezone.utc).isoformat()
+    print(f"Started: {started}")
     print("="*60)
     
-    # Run tests
-    await test_t4_1_webhook_endpoint()
-    await test_t4_2_call_initiated()
-    await test_t4_3_websocket_connection()
-    await test_t4_4_audio_receive()
-    await test_t4_5_audio_send()
-    await test_t4_6_call_hangup()
+    await _warm_up_connection()
+    
+    # Run independent tests concurrently; each uses its own call_id, and the
+    # HTTP tests share one pooled keep-alive client
+    async with httpx.AsyncClient(
+        base_url=BASE_URL,
+        timeout=10.0,
+        limits=HTTP_LIMITS,
+    ) as client:
+        async with asyncio.TaskGroup() as tg:
+            tg.create_task(test_t4_1_webhook_endpoint(client))
+            tg.create_task(test_t4_2_call_initiated(client))
+            tg.create_task(test_t4_3_websocket_connection())
+            tg.create_task(test_t4_4_audio_receive())
+            tg.create_task(test_t4_5_audio_send())
+            tg.create_task(test_t4_6_call_hangup(client))
+            tg.create_task(test_t4_8_status_check(client))
+    
+    # Concurrent-call capacity runs alone, so other WebSocket sessions
+    # do not skew it
     await test_t4_7_concurrent_calls()
-    await test_t4_8_status_check()
     
     # Summary
     print("\n" + "="*60)
     print("  TEST SUMMARY")
     print("="*60)
     
-    passed = sum(1 for r in results if r["passed"])
+    results.sort()
+    passed = sum(ok for _, ok, _ in results)
     total = len(results)
     
-    for r in results:
-        status = "✅" if r["passed"] else "❌"
-        print(f"  {status} {r['test']}")
+    for test_id, ok, _ in results:
+        status = "✅" if ok else "❌"
+        print(f"  {status} {test_id}")
     
     print("-"*60)
     print(f"  Results: {passed}/{total} tests passed")
@@ -366,6 +395,17 @@ async def main():
     
     print("="*60)
     
+    # Machine-readable summary for CI
+    sys.stdout.write(orjson.dumps({
+        "started": started,
+        "passed": passed,
+        "failed": total - passed,
+        "tests": [
+            {"test": test_id, "passed": ok, "details": details}
+            for test_id, ok, details in results
+        ],
+    }).decode() + "\n")
+    
     return passed == total
 
 
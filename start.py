@@ -1,17 +1,20 @@
 #!/usr/bin/env python
 """
 Startup script for Railway deployment.
-Reads PORT from environment and starts uvicorn.
+Reads PORT from environment and runs uvicorn in-process.
 """
 import os
-import subprocess
-import sys
 
-port = os.environ.get("PORT", "8000")
+import uvicorn
 
-subprocess.run([
-    sys.executable, "-m", "uvicorn",
-    "app.main:app",
-    "--host", "0.0.0.0",
-    "--port", port
-])
+if __name__ == "__main__":
+    uvicorn.run(
+        "app.main:app",
+        host="0.0.0.0",
+        port=int(os.environ.get("PORT", "8000")),
+        # "auto" selects uvloop and httptools (both in uvicorn[standard])
+        # when importable, falling back to asyncio/h11 elsewhere
+        loop="auto",
+        http="auto",
+        workers=int(os.environ.get("WEB_CONCURRENCY", "1")),
+    )
@@ -4,6 +4,7 @@ Tests: Circuit breaker, fallback messages, graceful degradation.
 """
 
 import asyncio
+import re
 import pytest
 from unittest.mock import AsyncMock, patch
 
@@ -11,11 +12,37 @@ import sys
 sys.path.insert(0, ".")
 
 
+# Any character in the Arabic Unicode block
+ARABIC_CHAR = re.compile("[\u0600-\u06FF]")
+
+
+class ServiceUnavailable(Exception):
+    """Failure raised by the simulated downstream service."""
+
+
+class FakeClock:
+    """Manually advanced stand-in for time.monotonic."""
+    
+    def __init__(self) -> None:
+        self.now = 0.0
+    
+    def __call__(self) -> float:
+        return self.now
+    
+    def advance(self, seconds: float) -> None:
+        self.now += seconds
+
+
 class TestCircuitBreaker:
     """Test circuit breaker functionality."""
     
     @pytest.fixture
-    def breaker(self):
+    def clock(self):
+        """Create a fake clock starting at zero."""
+        return FakeClock()
+    
+    @pytest.fixture
+    def breaker(self, clock):
         """Create fresh circuit breaker."""
         from app.utils.circuit_breaker import CircuitBreaker, CircuitBreakerConfig
         
@@ -23,7 +50,7 @@ class TestCircuitBreaker:
             failure_threshold=3,
             recovery_timeout=1.0,  # Short timeout for testing
         )
-        return CircuitBreaker("test_service", config)
+        return CircuitBreaker("test_service", config, time_func=clock)
     
     @pytest.mark.asyncio
     async def test_circuit_opens_after_threshold_failures(self, breaker):
@@ -31,11 +58,11 @@ class TestCircuitBreaker:
         from app.utils.circuit_breaker import CircuitState, CircuitBreakerOpen
         
         async def failing_function():
-            raise Exception("Service unavailable")
+            raise ServiceUnavailable("Service unavailable")
         
         # Trigger failures up to threshold
         for i in range(3):
-            with pytest.raises(Exception):
+            with pytest.raises(ServiceUnavailable):
                 await breaker.call(failing_function)
         
         # Circuit should be open now
@@ -48,29 +75,28 @@ class TestCircuitBreaker:
         assert exc_info.value.service_name == "test_service"
     
     @pytest.mark.asyncio
-    async def test_circuit_recovers_after_timeout(self, breaker):
+    async def test_circuit_recovers_after_timeout(self, breaker, clock):
         """Test that circuit transitions to half-open after timeout."""
         from app.utils.circuit_breaker import CircuitState
-        import time
         
         async def failing_function():
-            raise Exception("Service unavailable")
+            raise ServiceUnavailable("Service unavailable")
         
         # Open the circuit
         for _ in range(3):
-            with pytest.raises(Exception):
+            with pytest.raises(ServiceUnavailable):
                 await breaker.call(failing_function)
         
         assert breaker.state == CircuitState.OPEN
         
-        # Wait for recovery timeout
-        await asyncio.sleep(1.1)
+        # Advance past the recovery timeout
+        clock.advance(1.1)
         
         # Circuit should be half-open
         assert breaker.state == CircuitState.HALF_OPEN
     
     @pytest.mark.asyncio
-    async def test_successful_calls_close_circuit(self, breaker):
+    async def test_successful_calls_close_circuit(self, breaker, clock):
         """Test that successful calls close the circuit."""
         from app.utils.circuit_breaker import CircuitState
         
@@ -90,8 +116,8 @@ class TestCircuitBreaker:
         
         assert breaker.state == CircuitState.OPEN
         
-        # Wait for recovery
-        await asyncio.sleep(1.1)
+        # Advance past the recovery timeout
+        clock.advance(1.1)
         
         # Successful call should close circuit
         result = await breaker.call(sometimes_failing_function)
@@ -112,77 +138,47 @@ class TestCircuitBreaker:
         # All fallback messages should contain Arabic
         for key, message in config.fallback_messages.items():
             # Check for Arabic characters
-            has_arabic = any('\u0600' <= char <= '\u06FF' for char in message)
-            assert has_arabic, f"Message for '{key}' should be in Arabic"
+            assert ARABIC_CHAR.search(message), f"Message for '{key}' should be in Arabic"
 
 
 class TestServiceFallbacks:
     """Test service-specific fallback handling."""
     
     @pytest.mark.asyncio
-    async def test_asr_fallback_on_failure(self):
-        """Test ASR service returns fallback on failure."""
+    @pytest.mark.parametrize(
+        "service, error_type, message, failures, needles",
+        [
+            ("asr", Exception, "ElevenLabs API error", 3, ("ما سمعتك", "عذراً")),
+            ("llm", asyncio.TimeoutError, "LLM timeout", 5, ("مشغول", "لحظة")),
+            ("tts", Exception, "TTS API error", 3, ("مشكلة", "عذراً")),
+        ],
+        ids=["asr", "llm", "tts"],
+    )
+    async def test_fallback_after_failures(
+        self, service, error_type, message, failures, needles
+    ):
+        """Test each service breaker opens with its Arabic fallback message."""
         from app.utils.circuit_breaker import CircuitBreakers, CircuitBreakerOpen
         
+        breaker = getattr(CircuitBreakers, service)
+        
         # Reset for clean test
-        CircuitBreakers.asr.reset()
+        breaker.reset()
         
-        async def mock_asr():
-            raise Exception("ElevenLabs API error")
+        async def mock_service():
+            raise error_type(message)
         
         # Trigger failures
-        for _ in range(3):
-            with pytest.raises(Exception):
-                await CircuitBreakers.asr.call(mock_asr)
+        for _ in range(failures):
+            with pytest.raises(error_type):
+                await breaker.call(mock_service)
         
         # Get fallback message
         with pytest.raises(CircuitBreakerOpen) as exc_info:
-            await CircuitBreakers.asr.call(mock_asr)
-        
-        fallback = exc_info.value.fallback_message
-        assert "ما سمعتك" in fallback or "عذراً" in fallback
-    
-    @pytest.mark.asyncio
-    async def test_llm_fallback_on_timeout(self):
-        """Test LLM service returns fallback on timeout."""
-        from app.utils.circuit_breaker import CircuitBreakers, CircuitBreakerOpen
-        
-        CircuitBreakers.llm.reset()
-        
-        async def mock_llm():
-            raise asyncio.TimeoutError("LLM timeout")
-        
-        # Trigger failures
-        for _ in range(5):
-            with pytest.raises(asyncio.TimeoutError):
-                await CircuitBreakers.llm.call(mock_llm)
-        
-        # Get fallback
-        with pytest.raises(CircuitBreakerOpen) as exc_info:
-            await CircuitBreakers.llm.call(mock_llm)
-        
-        fallback = exc_info.value.fallback_message
-        assert "مشغول" in fallback or "لحظة" in fallback
-    
-    @pytest.mark.asyncio
-    async def test_tts_fallback_on_failure(self):
-        """Test TTS service returns fallback on failure."""
-        from app.utils.circuit_breaker import CircuitBreakers, CircuitBreakerOpen
-        
-        CircuitBreakers.tts.reset()
-        
-        async def mock_tts():
-            raise Exception("TTS API error")
-        
-        for _ in range(3):
-            with pytest.raises(Exception):
-                await CircuitBreakers.tts.call(mock_tts)
-        
-        with pytest.raises(CircuitBreakerOpen) as exc_info:
-            await CircuitBreakers.tts.call(mock_tts)
+            await breaker.call(mock_service)
         
         fallback = exc_info.value.fallback_message
-        assert "مشكلة" in fallback or "عذراً" in fallback
+        assert any(needle in fallback for needle in needles)
 
 
 class TestGracefulDegradation:
@@ -154,10 +154,12 @@ class TestConcurrentCalls:
             # Simulate processing time
             await asyncio.sleep(0.1)
         
-        # Create 10 concurrent bookings
-        tasks = []
-        for i in range(10):
-            task = event_bus.publish(
+        # Release 10 bookings at once so publishes genuinely overlap
+        barrier = asyncio.Barrier(10)
+        
+        async def book(i: int) -> None:
+            await barrier.wait()
+            await event_bus.publish(
                 EventType.APPOINTMENT_CREATED,
                 {
                     "patient_name": f"مريض {i}",
@@ -165,10 +167,12 @@ class TestConcurrentCalls:
                 },
                 source=f"call_{i}",
             )
-            tasks.append(task)
         
-        # Wait for all to complete
-        await asyncio.gather(*tasks)
+        start = asyncio.get_running_loop().time()
+        async with asyncio.TaskGroup() as tg:
+            for i in range(10):
+                tg.create_task(book(i))
+        elapsed = asyncio.get_running_loop().time() - start
         
         # Assert all events were processed
         assert len(events_received) == 10
@@ -176,6 +180,9 @@ class TestConcurrentCalls:
         # Verify no duplicate processing
         call_ids = [e.data["call_id"] for e in events_received]
         assert len(set(call_ids)) == 10
+        
+        # Handlers ran concurrently, not serialized behind one another
+        assert elapsed < 0.5
 
 
 class TestLatencyRequirements:
@@ -190,26 +197,30 @@ class TestLatencyRequirements:
         # Clear previous handlers to get accurate timing
         event_bus.clear()
         
-        processing_times = []
-        
         @event_bus.on(EventType.APPOINTMENT_CREATED)
         async def measure_processing(event):
             # Minimal processing
             _ = event.to_dict()
         
-        # Measure processing time
-        for i in range(10):
-            start = time.perf_counter()
+        # Warm up, then measure enough samples for stable percentiles
+        warmup, iterations = 100, 1000
+        for i in range(warmup):
+            await event_bus.publish(EventType.APPOINTMENT_CREATED, {"index": i})
+        
+        samples_ns = [0] * iterations
+        for i in range(iterations):
+            start = time.perf_counter_ns()
             await event_bus.publish(
                 EventType.APPOINTMENT_CREATED,
                 {"index": i},
             )
-            elapsed_ms = (time.perf_counter() - start) * 1000
-            processing_times.append(elapsed_ms)
+            samples_ns[i] = time.perf_counter_ns() - start
         
-        # Assert average under 100ms (realistic for async operations)
-        avg_time = sum(processing_times) / len(processing_times)
-        assert avg_time < 100, f"Average processing time {avg_time:.2f}ms > 100ms"
+        # Assert p99 under 100ms (realistic for async operations)
+        samples_ns.sort()
+        p50_ms = samples_ns[iterations // 2] / 1e6
+        p99_ms = samples_ns[iterations * 99 // 100] / 1e6
+        assert p99_ms < 100, f"p99 processing time {p99_ms:.2f}ms > 100ms (p50 {p50_ms:.2f}ms)"
 
 
 if __name__ == "__main__":